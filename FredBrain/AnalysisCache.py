@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class AnalysisCache:
+    """
+    Stores model answers on disk, keyed by a hash of everything that determines them: the model, the question and
+    the summarized data that was sent. Re-running a report over unchanged data therefore finds every answer in the
+    cache, while any change in the data changes its summary and therefore its key.
+
+    Each answer is a small JSON file in `path`, written to a temporary file first and moved into place, so a crash
+    never leaves a half-written entry and concurrent writers do not interfere.
+
+    Attributes:
+    - path (str): The cache folder. It is created if needed.
+
+    Usage:
+        cache = AnalysisCache("cache/analyses")
+        key = cache.key("gpt-3.5-turbo", "What is the trend?", [summary])
+        answer = cache.get(key)
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(model, question, summaries):
+        payload = json.dumps({'model': model, 'question': question, 'summaries': list(summaries)}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key):
+        """
+        Returns the cached answer for `key`, or None if there is none.
+        """
+        try:
+            with open(self._file(key), 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)['answer']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, answer, model=None, question=None):
+        entry = {
+            'answer': answer,
+            'model': model,
+            'question': question,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        temp_path = f"{self._file(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(entry, cache_file, indent=2)
+        os.replace(temp_path, self._file(key))
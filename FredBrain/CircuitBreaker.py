@@ -0,0 +1,97 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Pauses request dispatch while the remote API is failing.
+
+    The breaker starts closed. After `failure_threshold` consecutive failures it opens, and every caller of
+    before_request blocks until `reset_timeout` seconds have passed. The breaker then turns half-open and lets a
+    single trial request through: success closes it again, failure re-opens it for another `reset_timeout`.
+    Callers are paused rather than rejected, so bulk runs resume on their own once the API recovers.
+
+    Attributes:
+    - failure_threshold (int): Consecutive failures that open the breaker.
+    - reset_timeout (float): Seconds the breaker stays open before a trial request is allowed.
+    - trial_timeout (float): Seconds after which a trial request that never reported back is given up on, so the
+      next caller can send a trial of its own.
+
+    Usage:
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        breaker.before_request()
+        try:
+            response = requests.get(url, timeout=10)
+            breaker.record_success()
+        except requests.ConnectionError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+    trial_timeout = 300.0
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.trial_started = None
+        self.condition = threading.Condition()
+
+    def before_request(self):
+        """
+        Blocks while the breaker is open, or while another caller's trial request is in flight.
+        """
+        with self.condition:
+            while True:
+                if self.state == self.CLOSED:
+                    return
+                if self.state == self.OPEN:
+                    remaining = self.opened_at + self.reset_timeout - time.time()
+                    if remaining > 0:
+                        print(f"Circuit breaker open. Pausing requests for {remaining:.1f} seconds.")
+                        self.condition.wait(remaining)
+                        continue
+                    self.state = self.HALF_OPEN
+                stale_in = (self.trial_started or 0) + self.trial_timeout - time.time()
+                if not self.trial_in_flight or stale_in <= 0:
+                    self.trial_in_flight = True
+                    self.trial_started = time.time()
+                    return
+                self.condition.wait(stale_in)
+
+    def record_success(self):
+        with self.condition:
+            self.failures = 0
+            self.trial_in_flight = False
+            if self.state != self.CLOSED:
+                print("Circuit breaker closed. Resuming requests.")
+            self.state = self.CLOSED
+            self.condition.notify_all()
+
+    def release(self):
+        """
+        Ends a request that neither succeeded nor failed at the API, e.g. because of a local error, without counting
+        it either way. A half-open breaker lets the next caller send the trial instead.
+        """
+        with self.condition:
+            self.trial_in_flight = False
+            self.condition.notify_all()
+
+    def record_failure(self):
+        with self.condition:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"Circuit breaker opened after {self.failures} consecutive failures.")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+            self.condition.notify_all()
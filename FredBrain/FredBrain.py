@@ -1,13 +1,46 @@
 # Class for designing methods to extract first versions of released figures from the Fred API - Alexander Richt
 import os
-from datetime import date
-import pandas as pd
-import requests
-import openai
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import functools
 import hashlib
-from RateLimit import RateLimitDecorator
-from concurrent.futures import ThreadPoolExecutor
-import concurrent.futures
+import json
+import random
+import threading
+import time
+try:
+    from .AnalysisCache import AnalysisCache
+    from .CircuitBreaker import CircuitBreaker
+    from .JobManifest import JobManifest
+    from .KeyPool import KeyPool
+    from .LazyImport import LazyModule
+    from .RateLimit import MemoryRateLimitBackend
+    from .Revisions import compact_releases, nth_release
+    from .SearchIndex import SearchIndex
+    from .SeriesRegistry import SeriesRegistry
+    from .SingleFlight import SingleFlight, normalize_url
+    from .Summarize import summarize_chunks, summarize_frame
+    from .SyncState import SyncState
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from AnalysisCache import AnalysisCache
+    from CircuitBreaker import CircuitBreaker
+    from JobManifest import JobManifest
+    from KeyPool import KeyPool
+    from LazyImport import LazyModule
+    from RateLimit import MemoryRateLimitBackend
+    from Revisions import compact_releases, nth_release
+    from SearchIndex import SearchIndex
+    from SeriesRegistry import SeriesRegistry
+    from SingleFlight import SingleFlight, normalize_url
+    from Summarize import summarize_chunks, summarize_frame
+    from SyncState import SyncState
+
+# Heavy dependencies are only imported on first use so that importing FredBrain stays cheap
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+requests = LazyModule('requests')
+openai = LazyModule('openai')
+futures = LazyModule('concurrent.futures')
 
 
 def check_rate_limit(url):
@@ -22,12 +55,35 @@ def check_rate_limit(url):
 
 class FredBrain:
     earliest_realtime_start = '1776-07-04'
-    latest_realtime_end = date.today()
+    # None means today, taken at the time of each request so long-running processes keep seeing new vintages
+    latest_realtime_end = None
     nan_char = '.'
     calls_per_minute = 90
     root_url = 'https://api.stlouisfed.org/fred'
-
-    def __init__(self, fred_api_key=None, openai_api_key=None):
+    updates_page_size = 1000
+    release_dates_page_size = 1000
+    vintage_dates_page_size = 10000
+    max_vintage_dates_per_request = 2000
+    # Shared by every instance in the process that is not given its own rate_limit_backend
+    rate_limit_backend = MemoryRateLimitBackend()
+    # One RequestScheduler per rate limit bucket, so instances sharing an API key also share its queue
+    request_schedulers = {}
+    request_schedulers_lock = threading.Lock()
+    # Transient failures of idempotent GETs are retried with exponential backoff and full jitter
+    retry_statuses = (429, 500, 502, 503, 504)
+    backoff_base = 0.5
+    backoff_max = 30
+    circuit_failure_threshold = 5
+    circuit_reset_timeout = 30
+    updates_window_days = 14
+    # Data sent to the model is summarized to fit this many tokens; larger data is analysed in chunks
+    openai_model = "gpt-3.5-turbo"
+    summary_token_budget = 3000
+    analysis_workers = 4
+    analysis_retries = 2
+
+    def __init__(self, fred_api_key=None, openai_api_key=None, rate_limit_backend=None, timeout=(3.05, 30),
+                 max_retries=3, openai_base_url=None, openai_client=None):
         """
         Initialize an instance of the FredBrain class to interact with the FRED API.
 
@@ -36,7 +92,22 @@ class FredBrain:
 
         Parameters:
         - api_key (str, optional): A string that represents your FRED API key. If no API key is provided, the
-          constructor will attempt to retrieve it from an environment variable named 'FRED_API_KEY'.
+          constructor will attempt to retrieve it from an environment variable named 'FRED_API_KEY'. A list of keys
+          creates a KeyPool: every key gets its own rate budget, requests are spread over the keys, and a throttled
+          or rejected key is failed over to the others. See key_usage for the per-key counts.
+        - rate_limit_backend (object, optional): Where the rate limit window is kept. By default all instances in
+          the process share one in-memory window per API key. Pass a SQLiteRateLimitBackend pointing at the same file
+          to make several processes on the host share one budget for a key, e.g.
+          FredBrain(fred_api_key=key, rate_limit_backend=SQLiteRateLimitBackend('/var/tmp/fred_rate_limit.sqlite'))
+        - timeout (float or tuple, optional): Connect and read timeouts in seconds for every FRED request, passed to
+          requests.get. Defaults to (3.05, 30) so a stuck connection cannot hold a worker thread indefinitely.
+        - max_retries (int, optional): How often a request that timed out, failed to connect or returned 429/5xx is
+          retried, with exponentially growing, jittered pauses. After `circuit_failure_threshold` consecutive
+          failures all requests pause for `circuit_reset_timeout` seconds before a single trial request is sent.
+        - openai_base_url (str, optional): An OpenAI-compatible endpoint to send analyses to instead of api.openai.com,
+          e.g. a local server. Defaults to the OPENAI_BASE_URL environment variable, if set.
+        - openai_client (object, optional): A ready client with a chat.completions.create method. Overrides
+          openai_api_key and openai_base_url.
 
         Usage:
         - To use an API key directly: fred = FredBrain(api_key='your_api_key_here')
@@ -47,11 +118,195 @@ class FredBrain:
         - To set an environment variable for your API key, you can use the export command in Unix/Linux/macOS
           or setx in Windows. For example, in Unix/Linux/macOS terminal: export FRED_API_KEY='your_api_key_here'
         """
-        self.fred_api_key = fred_api_key or os.environ.get('FRED_API_KEY')
+        if isinstance(fred_api_key, (list, tuple)):
+            fred_api_keys = list(fred_api_key)
+        else:
+            fred_api_keys = [fred_api_key or os.environ.get('FRED_API_KEY')]
+        # Each key has its own rate limiter and scheduler; requests are spread over them by _http_get
+        self.key_pool = KeyPool(fred_api_keys, self.calls_per_minute,
+                                backend=rate_limit_backend or self.rate_limit_backend,
+                                schedulers=self.request_schedulers, schedulers_lock=self.request_schedulers_lock)
+        self.fred_api_key = self.key_pool.keys[0].key
         self.openai_api_key = openai_api_key or os.environ.get('OPENAI_API_KEY')
-        openai.api_key = self.openai_api_key
+        self.openai_base_url = openai_base_url or os.environ.get('OPENAI_BASE_URL')
+        self.openai_client = openai_client
+        self.rate_limiter = self.key_pool.keys[0].rate_limiter
+        self.scheduler = self.key_pool.keys[0].scheduler
+        self.request_context = threading.local()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.circuit_breaker = CircuitBreaker(self.circuit_failure_threshold, self.circuit_reset_timeout)
+        # Every series record seen in a search, category, series or updates response, see fetch_series_info
+        self.series_registry = SeriesRegistry()
+        # Offline full-text search over every record in the registry, see search_local
+        self.search_index = SearchIndex()
+        self.series_registry.subscribe(self.search_index.add_records)
+        # Identical requests issued concurrently by different worker threads share one network call, see _request
+        self.in_flight = SingleFlight()
+
+    def _http_get(self, url):
+        """
+        Performs the actual network call. This is the only place that draws from the rate limit, so callers that
+        share an in-flight request through _request do not use up any of the budget.
+
+        Each attempt is sent with the key the KeyPool picks, after a slot from that key's rate limiter. With several
+        keys, a 429 rests the key and the request moves to another key straight away, and a key FRED rejects is
+        dropped from the pool without using up an attempt.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to `max_retries` times. A 429 response's
+        Retry-After header is honoured, otherwise the pause is drawn uniformly from zero to an exponentially growing
+        cap. Each attempt waits for the circuit breaker and takes a fresh rate limit slot. If all attempts fail, the
+        last error response is returned or the last exception is raised.
+        """
+        priority, deadline = self._current_priority()
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_request()
+            try:
+                pooled = self.key_pool.choose()
+                pooled.scheduler.acquire(pooled.rate_limiter, priority=priority, deadline=deadline)
+                response = requests.get(self.key_pool.with_key(url, pooled.key), timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self.key_pool.mark_failure(pooled)
+                self.circuit_breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                reason = type(exc).__name__
+                retry_after = None
+            except requests.RequestException:
+                # Other transport errors, e.g. a broken chunked body, still count against the API
+                self.key_pool.mark_failure(pooled)
+                self.circuit_breaker.record_failure()
+                raise
+            except BaseException:
+                # Every before_request must be answered, or a half-open breaker would wait on this trial forever
+                self.circuit_breaker.release()
+                raise
+            else:
+                if self.key_pool.is_rejected_key(response):
+                    # FRED answered, so the API itself is healthy
+                    self.circuit_breaker.record_success()
+                    if self.key_pool.mark_revoked(pooled):
+                        continue
+                    return response
+                if response.status_code not in self.retry_statuses:
+                    self.circuit_breaker.record_success()
+                    return response
+                self.key_pool.mark_failure(pooled)
+                if response.status_code == 429 and self.key_pool.mark_throttled(pooled):
+                    # Another key is rested and takes over without a pause
+                    self.circuit_breaker.record_success()
+                    if attempt == self.max_retries:
+                        return response
+                    attempt += 1
+                    continue
+                self.circuit_breaker.record_failure()
+                if attempt == self.max_retries:
+                    return response
+                reason = f"status {response.status_code}"
+                retry_after = response.headers.get('Retry-After')
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            if retry_after is not None and str(retry_after).isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"Request failed ({reason}), retrying in {delay:.1f} seconds "
+                  f"(attempt {attempt + 1} of {self.max_retries}).")
+            time.sleep(delay)
+            attempt += 1
+
+    def key_usage(self):
+        """
+        Reports the use of every API key: its state ('active', 'resting' after a 429, or 'revoked'), total calls,
+        calls in the current rate window, 429 responses and failed requests.
+
+        Returns:
+        - pandas.DataFrame: One row per key, identified by its last four characters.
+        """
+        return pd.DataFrame(self.key_pool.usage())
+
+    @contextmanager
+    def request_priority(self, priority, deadline=None):
+        """
+        Runs every FRED request made inside the `with` block, including those issued by worker threads of bulk
+        methods, under the given priority class. Requests from all threads share one rate budget, which is handed
+        out by the RequestScheduler: 'interactive' requests overtake queued 'normal' and 'backfill' requests, and
+        requests close to their deadline overtake everything. Outside such a block requests run as 'normal'.
+
+        Parameters:
+        - priority (str): 'interactive', 'normal' or 'backfill'.
+        - deadline (float, optional): Seconds from now by which the requests should be sent.
+
+        Usage:
+            # In a backfill job
+            with fred.request_priority('backfill'):
+                vintages = fred.retrieve_series_all_releases(all_series)
+
+            # Meanwhile, in a dashboard thread
+            with fred.request_priority('interactive', deadline=5):
+                latest = fred.retrieve_series_latest_release(dashboard_series)
+        """
+        if priority not in self.scheduler.priorities:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of {list(self.scheduler.priorities)}.")
+        previous = getattr(self.request_context, 'priority', None)
+        self.request_context.priority = (priority, time.time() + deadline if deadline is not None else None)
+        try:
+            yield
+        finally:
+            self.request_context.priority = previous
+
+    def _current_priority(self):
+        return getattr(self.request_context, 'priority', None) or ('normal', None)
+
+    def _submit(self, executor, func, *args, **kwargs):
+        """
+        Submits `func` to `executor` so that it runs under the submitting thread's request priority.
+        """
+        priority = self._current_priority()
+
+        def run_with_priority():
+            self.request_context.priority = priority
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.request_context.priority = None
+
+        return executor.submit(run_with_priority)
+
+    @staticmethod
+    def _page_results(page_futures, label):
+        """
+        Collects the pages fetched by `page_futures`. A page whose fetch raised is logged and returned as None, the
+        same as a page that could not be retrieved, so the caller's incomplete-result check handles both.
+        """
+        pages = []
+        for future in page_futures:
+            try:
+                pages.append(future.result())
+            except Exception as exc:
+                print(f"A page of {label} generated an exception: {exc}")
+                pages.append(None)
+        return pages
+
+    def _request(self, url):
+        """
+        Issues a GET request for `url` on behalf of every FredBrain method. Concurrent callers asking for the same
+        resource, e.g. overlapping searches or the first and latest release of one series, are coalesced by
+        normalized URL into one network call and receive the same response object. The API key is not part of
+        the URL's identity, since any key of the pool fetches the same resource.
+        """
+        return self.in_flight.do(normalize_url(url, ignore=('api_key',)), lambda: self._http_get(url))
+
+    @staticmethod
+    def _response_json(response):
+        """
+        Returns the parsed JSON body of `response`. The result is kept on the response, so callers sharing a
+        coalesced response parse it only once. Callers must treat the parsed data as read-only.
+        """
+        parsed = getattr(response, '_fredbrain_json', None)
+        if parsed is None:
+            parsed = response.json()
+            response._fredbrain_json = parsed
+        return parsed
 
-    @RateLimitDecorator(calls=calls_per_minute)
     def search_brain(self, search_text, filter_attributes=None, filter_values=None):
         """
         Searches for FRED series based on a given search text and applies optional filtering based on specified criteria.
@@ -90,38 +345,38 @@ class FredBrain:
         Ensure that the 'filter_attribute' matches the exact column name as found in the FRED series metadata for correct operation.
         """
         # https://api.stlouisfed.org/fred/series/search?search_text=monetary+service+index&api_key=abcdefghijklmnopqrstuvwxyz123456
-        # Ensure filter_attributes and filter_values are lists for uniform processing
-        formatted_search_text = '+'.join(search_text.split())
-        url = f"{self.root_url}/series/search?search_text={formatted_search_text}&api_key={self.fred_api_key}&file_type=json"
+        series_data = self._fetch_search_results(search_text)
+        if series_data is None:
+            return None
+        df = pd.DataFrame(series_data)
+        # Return the dataframe with or without filters applied
+        return self._filter_search_results(df, filter_attributes, filter_values)
+
+    def _fetch_search_results(self, search_text=None, tag_names=None):
+        """
+        Fetch that is leveraged by search_brain and search_brain_batch. Runs one full-text search, optionally narrowed
+        to series carrying all of `tag_names`, or a tag-only search when no text is given. Returns the list of series
+        records, or None if the request failed.
+        """
+        if search_text:
+            formatted_search_text = '+'.join(search_text.split())
+            url = f"{self.root_url}/series/search?search_text={formatted_search_text}&api_key={self.fred_api_key}&file_type=json"
+            if tag_names:
+                url += f"&tag_names={';'.join(tag_names)}"
+        else:
+            url = f"{self.root_url}/tags/series?tag_names={';'.join(tag_names)}&api_key={self.fred_api_key}&file_type=json"
         # Make the API call
-        response = requests.get(url)
+        response = self._request(url)
         # Check if the response status code is 200 (OK)
         if response.status_code == 200:
             try:
                 # Parse JSON response
-                data = response.json()
+                data = self._response_json(response)
                 # The information you want is under the 'seriess' key, which is a list of dictionaries
                 series_data = data.get('seriess', [])  # Adjust based on actual JSON response structure
-                df = pd.DataFrame(series_data)
-                # Apply filters if both filter_attributes and filter_values are provided and not empty
-                if filter_attributes and filter_values:
-                    # Ensure filter_attributes and filter_values are lists for uniform processing
-                    if not isinstance(filter_attributes, list):
-                        filter_attributes = [filter_attributes]
-                    if not isinstance(filter_values, list):
-                        filter_values = [filter_values]
-                    # Validate that filter lists are of equal length
-                    if len(filter_attributes) != len(filter_values):
-                        raise ValueError("Length of filter_attributes must match length of filter_values.")
-                    # Apply each filter sequentially
-                    for attribute, value in zip(filter_attributes, filter_values):
-                        if isinstance(value, str):
-                            df = df[df[attribute].str.contains(value, case=False, na=False)]
-                        else:  # Assuming numeric filtering
-                            df = df[df[attribute] >= value]
-                # Return the dataframe with or without filters applied
-                return df
-            except ValueError as e:
+                self.series_registry.add_records(series_data)
+                return series_data
+            except ValueError:
                 print("Response is not in JSON format.")
                 print("Response content:", response.text)
                 return None
@@ -130,7 +385,160 @@ class FredBrain:
             print("Response content:", response.text)
             return None
 
-    @RateLimitDecorator(calls=calls_per_minute)
+    @staticmethod
+    def _filter_search_results(df, filter_attributes=None, filter_values=None):
+        """
+        Applies the filter_attributes/filter_values filters of search_brain to a frame of series records.
+        """
+        # Apply filters if both filter_attributes and filter_values are provided and not empty
+        if filter_attributes and filter_values:
+            # Ensure filter_attributes and filter_values are lists for uniform processing
+            if not isinstance(filter_attributes, list):
+                filter_attributes = [filter_attributes]
+            if not isinstance(filter_values, list):
+                filter_values = [filter_values]
+            # Validate that filter lists are of equal length
+            if len(filter_attributes) != len(filter_values):
+                raise ValueError("Length of filter_attributes must match length of filter_values.")
+            # Apply each filter sequentially
+            for attribute, value in zip(filter_attributes, filter_values):
+                if isinstance(value, str):
+                    df = df[df[attribute].str.contains(value, case=False, na=False)]
+                else:  # Assuming numeric filtering
+                    df = df[df[attribute] >= value]
+        return df
+
+    def search_brain_batch(self, queries, filter_attributes=None, filter_values=None):
+        """
+        Runs many searches concurrently and returns one deduplicated frame of the series they found, recording which
+        searches matched each series.
+
+        All searches draw from the same rate budget as every other request, so a batch of twenty terms completes in
+        roughly the time of the slowest search rather than the sum of all of them.
+
+        Parameters:
+        - queries (list): The searches to run. Each item is either a search text (str), a set of tags that series
+          must all carry (list, tuple or set of str, e.g. ['usa', 'gdp']), or a dict with 'search_text' and/or
+          'tag_names' to combine both.
+        - filter_attributes, filter_values (optional): Filters applied to the merged results, as in search_brain.
+
+        Returns:
+        - pandas.DataFrame: One row per series, with the metadata columns of search_brain plus 'Matched Terms' (the
+          searches that found the series, separated by '; ') and 'Match Count'. Series found by more searches come
+          first. Searches that failed are reported and skipped.
+
+        Usage:
+            universe = fred.search_brain_batch(["consumer price index", "core inflation", ["usa", "cpi"]],
+                                               "popularity", 50)
+            universe[['id', 'title', 'Matched Terms']]
+        """
+        searches = []
+        for query in queries:
+            if isinstance(query, dict):
+                search_text, tag_names = query.get('search_text'), list(query.get('tag_names') or [])
+            elif isinstance(query, str):
+                search_text, tag_names = query, []
+            else:
+                search_text, tag_names = None, list(query)
+            if not search_text and not tag_names:
+                raise ValueError("Every query needs a search text or tag names.")
+            label = ' '.join(filter(None, [search_text, f"[tags: {';'.join(tag_names)}]" if tag_names else None]))
+            searches.append((label, search_text, tag_names))
+        # The same search given twice is only run once
+        searches = list(dict((label, (label, text, tags)) for label, text, tags in searches).values())
+
+        records = {}
+        matches = {}
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            search_futures = [(label, self._submit(executor, self._fetch_search_results, search_text, tag_names))
+                              for label, search_text, tag_names in searches]
+            for label, future in search_futures:
+                try:
+                    series_data = future.result()
+                except Exception as exc:
+                    print(f"Search '{label}' generated an exception and is left out: {exc}")
+                    continue
+                if series_data is None:
+                    print(f"Search '{label}' failed and is left out.")
+                    continue
+                for record in series_data:
+                    records.setdefault(record['id'], record)
+                    matches.setdefault(record['id'], []).append(label)
+        print(f"{len(searches)} searches found {len(records)} distinct series.")
+        df = pd.DataFrame(list(records.values()))
+        if df.empty:
+            return df
+        df['Matched Terms'] = ['; '.join(matches[series_id]) for series_id in df['id']]
+        df['Match Count'] = [len(matches[series_id]) for series_id in df['id']]
+        df = df.sort_values('Match Count', ascending=False, kind='mergesort').reset_index(drop=True)
+        return self._filter_search_results(df, filter_attributes, filter_values)
+
+    def search_local(self, search_text, filter_attributes=None, filter_values=None, limit=100, fallback=True,
+                     min_results=1):
+        """
+        Searches the series metadata this instance has already seen, without calling the API.
+
+        Every series record returned by search_brain, search_brain_batch, get_series_from_category,
+        fetch_series_info, fetch_series_updates or fetch_series_tags is kept in a local full-text index over 'title',
+        'tags', 'units', 'frequency' and 'notes' (see SearchIndex). Results are ranked with BM25, title and tag
+        matches weighing most. Only a cold query, one that finds fewer than `min_results` series locally, is sent to
+        the API through search_brain, whose results then join the index.
+
+        Parameters:
+        - search_text (str): The text to search for.
+        - filter_attributes, filter_values (optional): Filters applied to the ranked results, as in search_brain.
+        - limit (int, optional): The largest number of series returned. Defaults to 100.
+        - fallback (bool, optional): Query the API for cold queries. Defaults to True.
+        - min_results (int, optional): The number of local matches below which a query counts as cold.
+
+        Returns:
+        - pandas.DataFrame: The matching series records, best match first, with a 'Score' column.
+
+        Usage:
+            fred.search_brain_batch(["inflation", "consumer price index", "unemployment"])
+            fred.search_local("core inflation", "frequency", "Monthly")
+        """
+        ranked = self.search_index.search(search_text)
+        if len(ranked) < min_results and fallback:
+            print(f"No local matches for '{search_text}', searching FRED.")
+            if self._fetch_search_results(search_text) is not None:
+                ranked = self.search_index.search(search_text)
+        records = []
+        for series_id, score in ranked:
+            record = self.series_registry.get(series_id)
+            if record is not None:
+                record['Score'] = round(score, 4)
+                records.append(record)
+        df = pd.DataFrame(records)
+        if df.empty:
+            return df
+        return self._filter_search_results(df, filter_attributes, filter_values).head(limit).reset_index(drop=True)
+
+    def fetch_series_tags(self, series_id):
+        """
+        Retrieves the tag names of a series from the FRED series/tags endpoint and adds them to the series' record
+        in the registry as 'tags', which makes them searchable with search_local. Only series that are already in
+        the registry (from a search, category listing or fetch_series_info) get the tags added.
+
+        Returns:
+        - list: The tag names, or None if they could not be retrieved.
+        """
+        url = f"{self.root_url}/series/tags?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
+        response = self._request(url)
+        if response.status_code == 200:
+            try:
+                tags = [tag['name'] for tag in self._response_json(response).get('tags', [])]
+            except ValueError:
+                print("Response is not in JSON format.")
+                print("Response content:", response.text)
+                return None
+            self.series_registry.add_records([{'id': series_id, 'tags': tags}], existing_only=True)
+            return tags
+        else:
+            print(f"Failed to fetch the tags of {series_id}. Status code: {response.status_code}")
+            print("Response content:", response.text)
+            return None
+
     def get_categories_range(self, start_id, end_id=None):
         """
         Retrieves a range of categories from the FRED database, each potentially related to multiple series.
@@ -168,9 +576,9 @@ class FredBrain:
         categories = []  # This will collect DataFrame pieces
         for category_id in range(start_id, end_id + 1):  # Ensure end_id is included
             url = f"{self.root_url}/category?category_id={category_id}&api_key={self.fred_api_key}&file_type=json"
-            response = requests.get(url)
+            response = self._request(url)
             if response.status_code == 200:
-                data = response.json()
+                data = self._response_json(response)
                 # Check if response contains 'categories' data
                 if 'categories' in data and data['categories']:
                     df = pd.DataFrame(data['categories'])
@@ -179,7 +587,7 @@ class FredBrain:
                     print(f"No data for category_id={category_id}")
             else:
                 # Check for error message in response and print it
-                error_info = response.json()
+                error_info = self._response_json(response)
                 if 'error_message' in error_info:
                     print(f"Error for category_id={category_id}: {error_info['error_message']}")
                 else:
@@ -233,10 +641,11 @@ class FredBrain:
         for _, category_row in all_categories.iterrows():
             category_id = category_row['id']
             series_url = f"{self.root_url}/category/series?category_id={category_id}&api_key={self.fred_api_key}&file_type=json"
-            response = requests.get(series_url)
+            response = self._request(series_url)
             if response.status_code == 200:
-                series_data = response.json()
+                series_data = self._response_json(response)
                 if 'seriess' in series_data and series_data['seriess']:
+                    self.series_registry.add_records(series_data['seriess'])
                     df_series = pd.DataFrame(series_data['seriess'])
                     df_series['category_id'] = category_row['id']
                     df_series['category_title'] = category_row['name']
@@ -251,7 +660,6 @@ class FredBrain:
             print("No series data collected.")
             return pd.DataFrame()
 
-    @RateLimitDecorator(calls=calls_per_minute)
     def fetch_single_series_info(self, series_id, relevant_info):
         """
         Fetch that is leveraged by the fetch_series_info method to execute concurrent requests for
@@ -259,15 +667,12 @@ class FredBrain:
         """
         url = f"{self.root_url}/series?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
         try:
-            response_api = requests.get(url)
+            response_api = self._request(url)
             if response_api.status_code == 200:
-                data = response_api.json()
+                data = self._response_json(response_api)
                 series_info = data['seriess'][0]  # Get the first item from the list
-                filtered_info = {key: series_info[key] for key in relevant_info if key in series_info}
-                filtered_info = pd.Series(filtered_info).astype(str)
-                concatenated_string = str(filtered_info['id']) + str(filtered_info['frequency']) + str(filtered_info['units'])
-                filtered_info['Unique Key'] = hashlib.sha256(concatenated_string.encode()).hexdigest()
-                return filtered_info
+                self.series_registry.add_records([series_info])
+                return self._series_info_from_record(series_info, relevant_info)
             else:
                 print(f"Failed to fetch {series_id}: Status {response_api.status_code}")
                 return pd.Series({"error": f"HTTP Status {response_api.status_code}"})
@@ -275,7 +680,19 @@ class FredBrain:
             print(f"Exception while fetching {series_id}: {str(e)}")
             return pd.Series({"error": str(e)})
 
-    def fetch_series_info(self, series_ids, relevant_info):
+    @staticmethod
+    def _series_info_from_record(series_info, relevant_info):
+        """
+        Builds the pandas.Series returned per series by fetch_series_info from a full series record, keeping only
+        the `relevant_info` fields and adding the 'Unique Key' hash of id, frequency and units.
+        """
+        filtered_info = {key: series_info[key] for key in relevant_info if key in series_info}
+        filtered_info = pd.Series(filtered_info).astype(str)
+        concatenated_string = str(filtered_info['id']) + str(filtered_info['frequency']) + str(filtered_info['units'])
+        filtered_info['Unique Key'] = hashlib.sha256(concatenated_string.encode()).hexdigest()
+        return filtered_info
+
+    def fetch_series_info(self, series_ids, relevant_info, refresh=False):
         """
         Fetches and returns detailed information for a list of FRED series IDs, filtering the results based on a list of relevant information fields specified by the user. This method leverages the FRED API to access and extract series metadata. It utilizes concurrent threads to efficiently manage multiple synchronous API requests, enhancing the speed of data retrieval and processing. This concurrency is particularly useful for augmenting data analysis, populating DataFrame columns, adjusting column headers, or for export purposes.
 
@@ -284,6 +701,7 @@ class FredBrain:
         Parameters:
         - series_id (str): The unique identifier for the FRED series from which information is to be retrieved.
         - relevant_info (list of str): Specifies the keys of information to fetch from the series data. This list should contain strings that match the desired data fields, such as 'id', 'title', 'frequency', 'units', 'popularity', and 'notes'.
+        - refresh (bool, optional): Series already returned by search_brain, get_series_from_category, fetch_series_updates or an earlier fetch_series_info call are answered from the instance's series registry without an API call. Set to True to request every series from FRED again.
 
         Returns:
         - pandas.Series: Contains the requested information for the specified series. Each index of the Series corresponds to an item in `relevant_info`, with its value from the FRED series metadata. Returns None if an error occurs or the requested information is not available.
@@ -310,10 +728,22 @@ class FredBrain:
         multiple series IDs, allowing for extensive data collection and analysis from the FRED database.
         """
         results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_series_id = {executor.submit(self.fetch_single_series_info, series_id, relevant_info): series_id
-                                   for series_id in series_ids}
-            for future in concurrent.futures.as_completed(future_to_series_id):
+        missing = []
+        for series_id in series_ids:
+            record = None if refresh else self.series_registry.get(series_id, complete=True)
+            if record is None:
+                missing.append(series_id)
+                continue
+            try:
+                results.append(self._series_info_from_record(record, relevant_info))
+            except Exception as exc:
+                print(f"Series ID {series_id} generated an exception: {exc}")
+        if len(missing) < len(series_ids):
+            print(f"{len(series_ids) - len(missing)} series answered from cached metadata, {len(missing)} requested from FRED.")
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            future_to_series_id = {self._submit(executor, self.fetch_single_series_info, series_id, relevant_info): series_id
+                                   for series_id in missing}
+            for future in futures.as_completed(future_to_series_id):
                 series_id = future_to_series_id[future]
                 try:
                     data = future.result()
@@ -327,7 +757,266 @@ class FredBrain:
                     print(f"Series ID {series_id} generated an exception: {exc}")
         return pd.DataFrame(results)
 
-    def transform_series(self, response_api, series_id, include_realtime=False):
+    def _fetch_series_updates_page(self, offset=0, start_time=None, end_time=None, filter_value='all'):
+        """
+        Fetch that is leveraged by the fetch_series_updates method to retrieve one page of the series/updates feed.
+        """
+        url = (f"{self.root_url}/series/updates?filter_value={filter_value}&limit={self.updates_page_size}"
+               f"&offset={offset}&api_key={self.fred_api_key}&file_type=json")
+        if start_time is not None and end_time is not None:
+            url += f"&start_time={start_time:%Y%m%d%H%M}&end_time={end_time:%Y%m%d%H%M}"
+        response = self._request(url)
+        if response.status_code == 200:
+            try:
+                return self._response_json(response)
+            except ValueError:
+                print("Response is not in JSON format.")
+                print("Response content:", response.text)
+                return None
+        else:
+            print(f"Failed to fetch series updates. Status code: {response.status_code}")
+            print("Response content:", response.text)
+            return None
+
+    def fetch_series_updates(self, start_time=None, end_time=None, filter_value='all', max_pages=None):
+        """
+        Retrieves the FRED series/updates feed, which lists every series whose data or metadata changed recently,
+        most recently updated first. Each row is a full series record, including 'id' and 'last_updated'.
+
+        Parameters:
+        - start_time (datetime, optional): Only include series updated at or after this time. Must be given together
+          with `end_time`. FRED only serves roughly the last two weeks of updates.
+        - end_time (datetime, optional): Only include series updated at or before this time.
+        - filter_value (str, optional): 'macro', 'regional' or 'all' (default).
+        - max_pages (int, optional): Give up and return None if the feed is longer than this many pages of
+          `updates_page_size` records. Useful when fetching metadata series by series would be cheaper.
+
+        Returns:
+        - pandas.DataFrame: The updated series records, or None if the feed could not be retrieved or exceeded
+          `max_pages`.
+
+        Usage:
+            from datetime import datetime, timedelta
+            now = datetime.now()
+            updates = fred.fetch_series_updates(start_time=now - timedelta(days=1), end_time=now)
+            print(updates[['id', 'title', 'last_updated']])
+        """
+        first_page = self._fetch_series_updates_page(0, start_time, end_time, filter_value)
+        if first_page is None:
+            return None
+        count = int(first_page.get('count', 0))
+        total_pages = -(-count // self.updates_page_size)
+        if max_pages is not None and total_pages > max_pages:
+            print(f"Series updates feed spans {total_pages} pages, more than the allowed {max_pages}.")
+            return None
+        pages = [first_page]
+        offsets = range(self.updates_page_size, count, self.updates_page_size)
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            page_futures = [self._submit(executor, self._fetch_series_updates_page, offset, start_time, end_time,
+                                         filter_value) for offset in offsets]
+            pages.extend(self._page_results(page_futures, "the series updates feed"))
+        if any(page is None for page in pages):
+            print("Failed to retrieve the complete series updates feed.")
+            return None
+        records = [record for page in pages for record in page.get('seriess', [])]
+        self.series_registry.add_records(records)
+        return pd.DataFrame(records)
+
+    def fetch_series_release(self, series_id):
+        """
+        Retrieves the release a series is published in, from the FRED series/release endpoint.
+
+        Parameters:
+        - series_id (str): The FRED series id.
+
+        Returns:
+        - dict: The release record, with 'id', 'name', 'press_release' and 'link', or None if it could not be
+          retrieved.
+
+        Usage:
+            release = fred.fetch_series_release("UNRATE")
+            print(release['id'], release['name'])
+        """
+        url = f"{self.root_url}/series/release?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
+        response = self._request(url)
+        if response.status_code == 200:
+            try:
+                releases = self._response_json(response).get('releases', [])
+                return releases[0] if releases else None
+            except ValueError:
+                print("Response is not in JSON format.")
+                print("Response content:", response.text)
+                return None
+        else:
+            print(f"Failed to fetch the release of {series_id}. Status code: {response.status_code}")
+            print("Response content:", response.text)
+            return None
+
+    def fetch_series_releases(self, series_ids):
+        """
+        Retrieves the release of every series in `series_ids` concurrently.
+
+        Returns:
+        - pandas.DataFrame: One row per series with 'series_id', 'release_id' and 'release_name'. Series whose release
+          could not be retrieved are left out.
+        """
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            release_futures = {series_id: self._submit(executor, self.fetch_series_release, series_id)
+                               for series_id in series_ids}
+            rows = []
+            for series_id, future in release_futures.items():
+                try:
+                    release = future.result()
+                except Exception as exc:
+                    print(f"Series ID {series_id} generated an exception and is left out: {exc}")
+                    continue
+                if release is not None:
+                    rows.append({'series_id': series_id, 'release_id': release['id'], 'release_name': release['name']})
+        return pd.DataFrame(rows, columns=['series_id', 'release_id', 'release_name'])
+
+    def _fetch_release_dates_page(self, offset, start_date, end_date):
+        """
+        Fetch that is leveraged by the fetch_release_dates method to retrieve one page of the releases/dates calendar.
+        """
+        url = (f"{self.root_url}/releases/dates?realtime_start={start_date:%Y-%m-%d}&realtime_end={end_date:%Y-%m-%d}"
+               f"&include_release_dates_with_no_data=true&order_by=release_date&sort_order=asc"
+               f"&limit={self.release_dates_page_size}&offset={offset}&api_key={self.fred_api_key}&file_type=json")
+        response = self._request(url)
+        if response.status_code == 200:
+            try:
+                return self._response_json(response)
+            except ValueError:
+                print("Response is not in JSON format.")
+                print("Response content:", response.text)
+                return None
+        else:
+            print(f"Failed to fetch release dates. Status code: {response.status_code}")
+            print("Response content:", response.text)
+            return None
+
+    def fetch_release_dates(self, start_date, end_date):
+        """
+        Retrieves the FRED release calendar between two dates, including scheduled future release dates.
+
+        Parameters:
+        - start_date (date): The first date of the calendar.
+        - end_date (date): The last date of the calendar.
+
+        Returns:
+        - pandas.DataFrame: One row per scheduled release with 'release_id', 'release_name' and 'date' (a datetime),
+          or None if the calendar could not be retrieved.
+
+        Usage:
+            from datetime import date, timedelta
+            calendar = fred.fetch_release_dates(date.today(), date.today() + timedelta(days=14))
+        """
+        first_page = self._fetch_release_dates_page(0, start_date, end_date)
+        if first_page is None:
+            return None
+        count = int(first_page.get('count', 0))
+        pages = [first_page]
+        offsets = range(self.release_dates_page_size, count, self.release_dates_page_size)
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            page_futures = [self._submit(executor, self._fetch_release_dates_page, offset, start_date, end_date)
+                            for offset in offsets]
+            pages.extend(self._page_results(page_futures, "the release calendar"))
+        if any(page is None for page in pages):
+            print("Failed to retrieve the complete release calendar.")
+            return None
+        records = [record for page in pages for record in page.get('release_dates', [])]
+        calendar = pd.DataFrame(records, columns=['release_id', 'release_name', 'date'])
+        calendar['date'] = pd.to_datetime(calendar['date'])
+        return calendar
+
+    def _fetch_vintage_dates_page(self, series_id, offset, realtime_start, realtime_end):
+        """
+        Fetch that is leveraged by the fetch_vintage_dates method to retrieve one page of a series' vintage dates.
+        """
+        url = (f"{self.root_url}/series/vintagedates?series_id={series_id}&realtime_start={realtime_start}"
+               f"&realtime_end={realtime_end}&limit={self.vintage_dates_page_size}&offset={offset}"
+               f"&api_key={self.fred_api_key}&file_type=json")
+        response = self._request(url)
+        if response.status_code == 200:
+            try:
+                return self._response_json(response)
+            except ValueError:
+                print("Response is not in JSON format.")
+                print("Response content:", response.text)
+                return None
+        else:
+            print(f"Failed to fetch the vintage dates of {series_id}. Status code: {response.status_code}")
+            print("Response content:", response.text)
+            return None
+
+    def fetch_vintage_dates(self, series_id, realtime_start=None, realtime_end=None):
+        """
+        Retrieves the dates on which a series' data was published or revised, from the FRED series/vintagedates
+        endpoint.
+
+        Parameters:
+        - series_id (str): The FRED series id.
+        - realtime_start (str, optional): The first date to consider. Defaults to the earliest available data.
+        - realtime_end (str, optional): The last date to consider. Defaults to today.
+
+        Returns:
+        - pandas.DatetimeIndex: The vintage dates in ascending order, or None if they could not be retrieved.
+
+        Usage:
+            vintages = fred.fetch_vintage_dates("GDP")
+            print(len(vintages), vintages[-1])
+        """
+        realtime_start = realtime_start or self.earliest_realtime_start
+        realtime_end = realtime_end or self.latest_realtime_end or date.today()
+        first_page = self._fetch_vintage_dates_page(series_id, 0, realtime_start, realtime_end)
+        if first_page is None:
+            return None
+        count = int(first_page.get('count', 0))
+        pages = [first_page]
+        offsets = range(self.vintage_dates_page_size, count, self.vintage_dates_page_size)
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            page_futures = [self._submit(executor, self._fetch_vintage_dates_page, series_id, offset, realtime_start,
+                                         realtime_end) for offset in offsets]
+            pages.extend(self._page_results(page_futures, f"the vintage dates of {series_id}"))
+        if any(page is None for page in pages):
+            print(f"Failed to retrieve every vintage date of {series_id}.")
+            return None
+        return pd.DatetimeIndex(sorted(set(vintage for page in pages for vintage in page.get('vintage_dates', []))))
+
+    def resolve_vintage_dates(self, series_id, vintage_dates=None, vintage_schedule=None, realtime_start=None,
+                              realtime_end=None):
+        """
+        Maps requested snapshot dates onto the vintages a series actually has.
+
+        Each requested date is replaced by the latest vintage published on or before it, which is the data as it
+        stood on that date. Dates before the first vintage are dropped, and dates that fall on the same vintage are
+        requested once.
+
+        Parameters:
+        - series_id (str): The FRED series id.
+        - vintage_dates (list, optional): Explicit snapshot dates.
+        - vintage_schedule (str, optional): A pandas frequency, e.g. 'QE', generating snapshot dates from the first
+          vintage until `realtime_end`.
+        - realtime_start (str, optional), realtime_end (str, optional): Limit the vintages considered.
+
+        Returns:
+        - list: The vintage dates as Timestamps in ascending order, or None if the vintages could not be retrieved.
+
+        Usage:
+            quarter_ends = fred.resolve_vintage_dates("GDP", vintage_schedule="QE")
+        """
+        available = self.fetch_vintage_dates(series_id, realtime_start, realtime_end)
+        if available is None:
+            return None
+        if available.empty:
+            return []
+        requested = pd.DatetimeIndex(pd.to_datetime(list(vintage_dates or [])))
+        if vintage_schedule is not None:
+            schedule_end = pd.Timestamp(realtime_end or self.latest_realtime_end or date.today())
+            requested = requested.append(pd.date_range(available[0], schedule_end, freq=vintage_schedule))
+        positions = available.searchsorted(requested, side='right') - 1
+        return list(available[np.unique(positions[positions >= 0])])
+
+    def transform_series(self, response_api, series_id, include_realtime=False, transform=None):
         """
         Transforms an API response into a structured pandas DataFrame.
 
@@ -338,6 +1027,8 @@ class FredBrain:
 
         Parameters:
         - response_api (Response): The response object from the requests library, containing the JSON data from the FRED API.
+        - transform (str, optional): The server-side transform the observations were requested with (see
+          _observation_options). It becomes part of the hash key, so transformed values never collide with raw ones.
 
         Returns:
         - pandas.DataFrame: A DataFrame with columns 'date' and 'value', where 'date' is formatted as datetime objects and 'value'
@@ -350,52 +1041,221 @@ class FredBrain:
         """
         try:
             # Attempt to parse the JSON data
-            data = response_api.json()
+            data = self._response_json(response_api)
         except ValueError:
             # Handle the case where the response is not in JSON format
             print("Response is not in JSON format.")
             return pd.DataFrame()  # Return an empty DataFrame
         # Check if 'observations' key is in the data
         if 'observations' in data:
-            # Extract observations data into a DataFrame
-            observations = data['observations']
-            df = pd.DataFrame(observations)
-            # Convert 'date' column to datetime objects
-            df['realtime_start'] = pd.to_datetime(df['realtime_start'])
-            df['realtime_end'] = pd.to_datetime(df['realtime_end'])
-            df['date'] = pd.to_datetime(df['date'])
-            # Convert 'value' column to numeric, set errors='coerce' to handle any conversion issues
-            df['value'] = pd.to_numeric(df['value'], errors='coerce').astype(float).round(5)
-            df['series'] = str(series_id)
-            if include_realtime:
-                df['hash_key'] = (df['realtime_start'].astype(str) + df['date'].astype(str) +
-                                  df['value'].astype(str) + df['series'].astype(str))
-            else:
-                df['hash_key'] = (df['date'].astype(str) + df['value'].astype(str) + df['series'].astype(str))
-
-            df['hash_key'] = df['hash_key'].apply(lambda x: hashlib.sha256(x.encode()).hexdigest())
-            return df
+            return self._decode_observations(data['observations'], series_id, include_realtime, transform)
         else:
             # If 'observations' key is not present, return an empty DataFrame
             print("'observations' key not found in the response.")
             return pd.DataFrame()
 
-    @RateLimitDecorator(calls=calls_per_minute)
-    def retrieve_single_series_latest_release(self, series_id):
+    def _decode_observations(self, observations, series_id, include_realtime=False, transform=None):
+        """
+        Decodes the 'observations' list of a FRED response into the DataFrame returned by transform_series.
+
+        The records are split into columnar arrays in a single pass. FRED reports every date as YYYY-MM-DD and the
+        same dates repeat across vintages, so each distinct date string is parsed once with a fixed format and the
+        raw strings are reused for the hash key. The nan_char marker is masked out before the values are handed to
+        pandas' numeric parser, so the resulting frame is identical to the one built from a list of dicts.
+        """
+        if not observations:
+            return pd.DataFrame()
+        columns = {key: [observation[key] for observation in observations]
+                   for key in ('realtime_start', 'realtime_end', 'date', 'value')}
+        df = pd.DataFrame({
+            'realtime_start': self._parse_dates(columns['realtime_start']),
+            'realtime_end': self._parse_dates(columns['realtime_end']),
+            'date': self._parse_dates(columns['date']),
+            'value': self._parse_values(columns['value']),
+        })
+        df['series'] = str(series_id)
+        dates = self._date_strings(columns['date'], df['date'])
+        values = [str(value) for value in df['value'].tolist()]
+        series = str(series_id) + (transform or '')
+        if include_realtime:
+            realtime_starts = self._date_strings(columns['realtime_start'], df['realtime_start'])
+            keys = [start + day + value + series for start, day, value in zip(realtime_starts, dates, values)]
+        else:
+            keys = [day + value + series for day, value in zip(dates, values)]
+        df['hash_key'] = [hashlib.sha256(key.encode()).hexdigest() for key in keys]
+        return df
+
+    @staticmethod
+    def _parse_dates(raw_dates):
+        """
+        Parses FRED date strings, trying the fixed YYYY-MM-DD format first. to_datetime caches repeated strings,
+        which is what makes vintage responses cheap to decode.
+        """
+        try:
+            return pd.to_datetime(raw_dates, format='%Y-%m-%d', cache=True)
+        except ValueError:
+            return pd.to_datetime(raw_dates)
+
+    @staticmethod
+    def _date_strings(raw_dates, parsed_dates):
+        """
+        Returns the date strings used in the hash key. The raw strings are used as-is when they are already in the
+        canonical YYYY-MM-DD form, which is always the case for FRED, and otherwise re-rendered from the parsed values.
+        """
+        if all(len(raw) == 10 for raw in set(raw_dates)):
+            return raw_dates
+        return parsed_dates.astype(str).tolist()
+
+    def _parse_values(self, raw_values):
+        """
+        Converts the raw 'value' strings to floats rounded to five decimals. The nan_char marker is masked out in one
+        vectorized comparison so pandas' numeric parser never has to raise and recover on it.
+        """
+        values = np.array(raw_values, dtype=object)
+        values[values == self.nan_char] = np.nan
+        return pd.to_numeric(values, errors='coerce').astype(float).round(5)
+
+    @staticmethod
+    def _observation_options(frequency=None, aggregation_method=None, units=None, observation_start=None,
+                             observation_end=None):
+        """
+        Builds the extra series/observations query parameters shared by the retrieve_series_* methods.
+
+        `frequency`, `aggregation_method` and `units` make FRED aggregate and transform the observations before
+        sending them, e.g. frequency='m', units='pch' returns monthly percent changes of a daily series.
+        `observation_start` and `observation_end` restrict the observation dates.
+
+        Returns:
+        - tuple: (query, transform), where `query` is appended to the request URL and `transform` labels the
+          server-side transform as e.g. 'frequency=m&units=pch', or is None when the native levels are requested.
+        """
+        transform = '&'.join(f"{name}={value}" for name, value in (
+            ('frequency', frequency), ('aggregation_method', aggregation_method), ('units', units)) if value)
+        window = ''.join(f"&{name}={value}" for name, value in (
+            ('observation_start', observation_start), ('observation_end', observation_end)) if value)
+        return (f"&{transform}" if transform else '') + window, transform or None
+
+    def _retrieve_concurrently(self, retrieve_single, series_ids, job_dir=None, sink=None, **kwargs):
+        """
+        Runs `retrieve_single` for each series ID on a pool of worker threads and combines the resulting DataFrames.
+        Shared by the retrieve_series_* methods.
+
+        When `job_dir` is given, a JobManifest in that folder records every completed or failed series. Series that
+        a previous run already completed are skipped, and unless a `sink` is supplied each finished series is written
+        to `job_dir/data` straight away, so the combined result survives a crash and is re-read from disk at the end.
+        The job is identified by the retrieval method and its arguments; re-using a `job_dir` with different
+        arguments raises a ValueError.
+        A custom `sink` receives (series_id, data_frame) on the calling thread and must be idempotent, since a series
+        interrupted between the sink and the manifest update is fetched and flushed again on the next run.
+        """
+        manifest = None
+        store_in_job = False
+        if job_dir is not None:
+            manifest = JobManifest(os.path.join(job_dir, 'manifest.jsonl'),
+                                   job=self._job_identity(retrieve_single, kwargs))
+            pending = manifest.pending(series_ids)
+            if len(pending) < len(series_ids):
+                print(f"Resuming job in {job_dir}: {len(series_ids) - len(pending)} series already completed, "
+                      f"{len(pending)} remaining.")
+            if sink is None:
+                store_in_job = True
+                sink = functools.partial(self._write_job_frame, job_dir)
+        else:
+            pending = series_ids
+        results = []
+        with futures.ThreadPoolExecutor(max_workers=20) as executor:
+            future_to_series_id = {self._submit(executor, retrieve_single, series_id, **kwargs): series_id
+                                   for series_id in pending}
+            for future in futures.as_completed(future_to_series_id):
+                series_id = future_to_series_id[future]
+                try:
+                    data = future.result()
+                    if data is not None:
+                        if sink is not None:
+                            sink(series_id, data)
+                        else:
+                            results.append(data)
+                        if manifest is not None:
+                            manifest.mark_complete(series_id, rows=len(data), watermark=self._watermark(data))
+                    else:
+                        print(f"Error fetching series ID {series_id}: No data returned.")
+                        if manifest is not None:
+                            manifest.mark_failed(series_id, "No data returned")
+                except Exception as exc:
+                    print(f"Series ID {series_id} generated an exception: {exc}")
+                    if manifest is not None:
+                        manifest.mark_failed(series_id, exc)
+        if store_in_job:
+            print(f"Job progress: {manifest.summary()}")
+            results = [self._read_job_frame(job_dir, series_id) for series_id in series_ids
+                       if manifest.is_complete(series_id)]
+        if results:
+            return pd.concat(results, ignore_index=True)
+        else:
+            return pd.DataFrame()
+
+    @staticmethod
+    def _job_identity(retrieve_single, kwargs):
+        """
+        Names a resumable job after the retrieval method and a hash of its arguments, so re-running into the same
+        job_dir with, say, different units or vintage dates raises instead of returning the earlier job's frames.
+        """
+        arguments = json.dumps({name: value for name, value in kwargs.items() if value is not None}, sort_keys=True,
+                               default=str)
+        return f"{retrieve_single.__name__}:{hashlib.sha256(arguments.encode()).hexdigest()[:16]}"
+
+    @staticmethod
+    def _watermark(data):
+        """
+        Returns the latest 'Published Date' in a retrieved frame as an ISO date string, or None if there is none.
+        """
+        if 'Published Date' in data and not data.empty:
+            return str(data['Published Date'].max().date())
+        return None
+
+    @staticmethod
+    def _job_frame_path(job_dir, series_id):
+        safe_id = ''.join(char if char.isalnum() or char in '-_' else '_' for char in str(series_id))
+        return os.path.join(job_dir, 'data', f"{safe_id}.pkl")
+
+    def _write_job_frame(self, job_dir, series_id, data):
+        """
+        Default job sink: pickles one series' frame under `job_dir/data`, replacing the file atomically so a crash
+        never leaves a half-written frame behind.
+        """
+        path = self._job_frame_path(job_dir, series_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        data.to_pickle(temp_path)
+        os.replace(temp_path, path)
+
+    def _read_job_frame(self, job_dir, series_id):
+        return pd.read_pickle(self._job_frame_path(job_dir, series_id))
+
+    def retrieve_single_series_latest_release(self, series_id, frequency=None, aggregation_method=None, units=None,
+                                              observation_start=None, observation_end=None, tail=None):
         """
         Retrieve that is leveraged by the retrieve_series_latest_release method to execute concurrent requests for
         series information by using the ThreadPoolExecutor for synchronous requests.
         """
-        url = f"{self.root_url}/series/observations?series_id={series_id}&api_key={self.fred_api_key}&file_type=json"
+        options, transform = self._observation_options(frequency, aggregation_method, units, observation_start,
+                                                       observation_end)
+        if tail:
+            # Newest observations first, so FRED only has to send the last `tail` of them
+            options += f"&sort_order=desc&limit={int(tail)}"
+        url = f"{self.root_url}/series/observations?series_id={series_id}&api_key={self.fred_api_key}&file_type=json{options}"
         url_website = "https://fred.stlouisfed.org/series/%s" % series_id
-        response_api = requests.get(url)
+        response_api = self._request(url)
         if response_api.status_code == 200:
             try:
-                df = self.transform_series(response_api, series_id)
+                df = self.transform_series(response_api, series_id, transform=transform)
                 if not df.empty:
                     df['Website URL'] = url_website
                     df['JSON URL'] = url
-                    latest_release = df[['realtime_start', 'date', 'value', 'series', 'hash_key', 'Website URL', 'JSON URL']]
+                    if transform:
+                        df['Transform'] = transform
+                    latest_release = df[['realtime_start', 'date', 'value', 'series'] + (['Transform'] if transform else [])
+                                        + ['hash_key', 'Website URL', 'JSON URL']]
                     latest_release = latest_release.rename(columns={
                         "realtime_start": "Published Date",
                         "date": "Reporting Date",
@@ -403,6 +1263,8 @@ class FredBrain:
                         "series": "Series",
                         "hash_key": "Unique Key"
                     })
+                    if tail:
+                        latest_release = latest_release.iloc[::-1].reset_index(drop=True)
                     return latest_release
             except ValueError:
                 print("Response is not in JSON format.")
@@ -413,7 +1275,9 @@ class FredBrain:
             print("Response content:", response_api.text)
             return None
 
-    def retrieve_series_latest_release(self, series_ids):
+    def retrieve_series_latest_release(self, series_ids, job_dir=None, sink=None, frequency=None,
+                                       aggregation_method=None, units=None, observation_start=None,
+                                       observation_end=None, tail=None):
         """
              Retrieves the latest release/publication of time series data for a specified FRED series identifier. Leverages concurrent threads to efficiently manage multiple synchronous API requests, enhancing the speed of data retrieval and processing. This concurrency is particularly useful for augmenting data analysis, populating DataFrame columns, adjusting column headers, or for export purposes.
 
@@ -421,6 +1285,14 @@ class FredBrain:
 
              Parameters:
              - series_id (str): The unique identifier for the FRED series from which to retrieve observation data. Example series IDs include 'GDP' for Gross Domestic Product, 'UNRATE' for Unemployment Rate, etc.
+             - job_dir (str, optional): A folder that turns the call into a resumable job. Progress is recorded in a manifest inside the folder and each finished series is flushed as soon as it arrives, so re-running the same call skips every series completed before a failure.
+             - sink (callable, optional): Called as sink(series_id, data_frame) for every finished series instead of keeping it in memory, e.g. lambda series_id, df: db_manager.insert_new_rows(df, 'AllReleases'). When a sink is given an empty DataFrame is returned.
+             - frequency (str, optional): Have FRED aggregate the observations to a lower frequency, e.g. 'm', 'q' or 'a', instead of downloading native-frequency points.
+             - aggregation_method (str, optional): How observations are aggregated to `frequency`: 'avg' (FRED's default), 'sum' or 'eop'.
+             - units (str, optional): Have FRED transform the values, e.g. 'pch' (percent change), 'pc1' (percent change from a year ago) or 'log'. When any of frequency, aggregation_method or units is given, the frame gets a 'Transform' column such as 'frequency=m&units=pch' and the transform becomes part of the 'Unique Key', so transformed rows never collide with raw ones.
+             - observation_start (str, optional): The first observation date to retrieve, as YYYY-MM-DD.
+             - observation_end (str, optional): The last observation date to retrieve, as YYYY-MM-DD.
+             - tail (int, optional): Only retrieve the most recent `tail` observations of each series (at most 100000). FRED is asked for them newest first with sort_order=desc and limit, so response size and latency stay the same however long the series is. The rows are returned oldest first, as without tail. Combine with observation_start to also drop points older than a date.
 
              Returns:
              - pandas.DataFrame: A DataFrame containing two columns, 'date' and 'value', representing the time series data of the specified FRED series. Each row corresponds to an observation date and its associated value.
@@ -437,62 +1309,80 @@ class FredBrain:
              - The method ensures that the API response is in JSON format before attempting to parse it. If the response is not in JSON format, or if the API call fails (e.g., due to an incorrect series ID or network issues), an appropriate message is printed, and None is returned.
              - Users should ensure that the provided `series_id` is valid and corresponds to a series available in the FRED database. A list of valid series IDs can be found on the FRED website.
             """
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_series_id = {executor.submit(self.retrieve_single_series_latest_release, series_id): series_id
-                                   for series_id in series_ids}
-            for future in concurrent.futures.as_completed(future_to_series_id):
-                series_id = future_to_series_id[future]
-                try:
-                    data = future.result()
-                    if data is not None:
-                        results.append(data)
-                    else:
-                        print(f'Error fetching series ID {series_id}: No data returned.')
-                except Exception as exc:
-                    print(f"Series ID {series_id} generated an exception: {exc}")
-        if results:
-            return pd.concat(results, ignore_index=True)
-        else:
-            return pd.DataFrame()
-
-    @RateLimitDecorator(calls=calls_per_minute)
-    def retrieve_single_series_all_releases(self, series_id, realtime_start=None, realtime_end=None):
+        return self._retrieve_concurrently(self.retrieve_single_series_latest_release, series_ids, job_dir=job_dir, sink=sink,
+                                           frequency=frequency, aggregation_method=aggregation_method, units=units,
+                                           observation_start=observation_start, observation_end=observation_end,
+                                           tail=tail)
+
+    def retrieve_single_series_all_releases(self, series_id, realtime_start=None, realtime_end=None, compact=False,
+                                            frequency=None, aggregation_method=None, units=None,
+                                            observation_start=None, observation_end=None, vintage_dates=None,
+                                            vintage_schedule=None):
         """
         Retrieve that is leveraged by the retrieve_series_all_releases method to execute concurrent requests for
         series information by using the ThreadPoolExecutor for synchronous requests.
         """
         realtime_start = realtime_start or self.earliest_realtime_start
-        realtime_end = realtime_end or self.latest_realtime_end
-        url = f"{self.root_url}/series/observations?series_id={series_id}&realtime_start={realtime_start}&realtime_end={realtime_end}&api_key={self.fred_api_key}&file_type=json"
+        realtime_end = realtime_end or self.latest_realtime_end or date.today()
+        options, transform = self._observation_options(frequency, aggregation_method, units, observation_start,
+                                                       observation_end)
+        if vintage_dates is None and vintage_schedule is None:
+            periods = [f"realtime_start={realtime_start}&realtime_end={realtime_end}"]
+        else:
+            vintages = self.resolve_vintage_dates(series_id, vintage_dates, vintage_schedule, realtime_start,
+                                                  realtime_end)
+            if vintages is None:
+                return None
+            if not vintages:
+                print(f"No vintages of {series_id} match the requested dates.")
+                return pd.DataFrame()
+            # FRED caps the number of vintage dates per request, so long schedules are split into batches
+            periods = ["vintage_dates=" + ','.join(f"{vintage:%Y-%m-%d}" for vintage in
+                                                    vintages[i:i + self.max_vintage_dates_per_request])
+                       for i in range(0, len(vintages), self.max_vintage_dates_per_request)]
         url_website = "https://fred.stlouisfed.org/series/%s" % series_id
-        response_api = requests.get(url)
-        if response_api.status_code == 200:
+        frames = []
+        for period in periods:
+            url = f"{self.root_url}/series/observations?series_id={series_id}&{period}&api_key={self.fred_api_key}&file_type=json{options}"
+            response_api = self._request(url)
+            if response_api.status_code != 200:
+                print(f"Failed to fetch data. Status code: {response_api.status_code}")
+                print("Response content:", response_api.text)
+                return None
             try:
-                df = self.transform_series(response_api, series_id, include_realtime=True)
-                if not df.empty:
-                    df['Website URL'] = url_website
-                    df['JSON URL'] = url
-                    all_releases = df[['realtime_start', 'realtime_end', 'date', 'value', 'series', 'hash_key', 'Website URL', 'JSON URL']]
-                    all_releases = all_releases.rename(columns={
-                        "realtime_start": "Published Date",
-                        "realtime_end": "Validity Date",
-                        "date": "Reporting Date",
-                        "value": "Value",
-                        "series": "Series",
-                        "hash_key": "Unique Key"
-                    })
-                    return all_releases
+                df = self.transform_series(response_api, series_id, include_realtime=True, transform=transform)
             except ValueError:
                 print("Response is not in JSON format.")
                 print("Response content:", response_api.text)
                 return None
-        else:
-            print(f"Failed to fetch data. Status code: {response_api.status_code}")
-            print("Response content:", response_api.text)
+            if not df.empty:
+                df['Website URL'] = url_website
+                df['JSON URL'] = url
+                frames.append(df)
+        if not frames:
             return None
-
-    def retrieve_series_all_releases(self, series_ids):
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if len(frames) > 1:
+            df = df.drop_duplicates('hash_key').sort_values(['date', 'realtime_start'], ignore_index=True)
+        if transform:
+            df['Transform'] = transform
+        all_releases = df[['realtime_start', 'realtime_end', 'date', 'value', 'series']
+                          + (['Transform'] if transform else []) + ['hash_key', 'Website URL', 'JSON URL']]
+        all_releases = all_releases.rename(columns={
+            "realtime_start": "Published Date",
+            "realtime_end": "Validity Date",
+            "date": "Reporting Date",
+            "value": "Value",
+            "series": "Series",
+            "hash_key": "Unique Key"
+        })
+        if compact:
+            all_releases = compact_releases(all_releases)
+        return all_releases
+
+    def retrieve_series_all_releases(self, series_ids, job_dir=None, sink=None, compact=False, frequency=None,
+                                     aggregation_method=None, units=None, observation_start=None, observation_end=None,
+                                     vintage_dates=None, vintage_schedule=None):
         """
         Retrieves all historical data releases for a given FRED series ID, including initial releases and subsequent revisions. Leverages concurrent threads to efficiently manage multiple synchronous API requests, enhancing the speed of data retrieval and processing. This concurrency is particularly useful for augmenting data analysis, populating DataFrame columns, adjusting column headers, or for export purposes.
 
@@ -500,52 +1390,58 @@ class FredBrain:
 
         Parameters:
         - series_id (str): The FRED series ID for which to retrieve the data.
+        - job_dir (str, optional): A folder that turns the call into a resumable job. Progress is recorded in a manifest inside the folder and each finished series is flushed as soon as it arrives, so re-running the same call skips every series completed before a failure.
+        - sink (callable, optional): Called as sink(series_id, data_frame) for every finished series instead of keeping it in memory, e.g. lambda series_id, df: db_manager.insert_new_rows(df, 'AllReleases'). When a sink is given an empty DataFrame is returned.
         - realtime_start (str, optional): The start of the realtime period for which to retrieve data. Defaults to the earliest available data.
         - realtime_end (str, optional): The end of the realtime period for which to retrieve data. Defaults to the latest available data.
+        - compact (bool, optional): Keep only the vintages in which a reporting date's value changed, merging the validity intervals of unchanged re-publications (see Revisions.compact_releases). Defaults to False.
+        - frequency (str, optional): Have FRED aggregate the observations to a lower frequency, e.g. 'm', 'q' or 'a', instead of downloading native-frequency points.
+        - aggregation_method (str, optional): How observations are aggregated to `frequency`: 'avg' (FRED's default), 'sum' or 'eop'.
+        - units (str, optional): Have FRED transform the values, e.g. 'pch' (percent change), 'pc1' (percent change from a year ago) or 'log'. When any of frequency, aggregation_method or units is given, the frame gets a 'Transform' column such as 'frequency=m&units=pch' and the transform becomes part of the 'Unique Key', so transformed rows never collide with raw ones.
+        - observation_start (str, optional): The first observation date to retrieve, as YYYY-MM-DD.
+        - observation_end (str, optional): The last observation date to retrieve, as YYYY-MM-DD.
+        - vintage_dates (list, optional): Only retrieve the data as it stood on these dates. Each date is mapped to the latest vintage of the series published on or before it (see resolve_vintage_dates), and only those vintages are requested, `max_vintage_dates_per_request` at a time.
+        - vintage_schedule (str, optional): A pandas frequency such as 'QE' or 'ME' that generates the vintage dates, from the series' first vintage until today, e.g. 'QE' for the quarter-end snapshots used to re-estimate a model. Can be combined with `vintage_dates`.
 
         Returns:
         - pandas.DataFrame: A DataFrame with columns 'date', 'realtime_start', and 'value', where 'date' is the observation date and 'realtime_start' is the date when the corresponding value was first released or revised.
 
         If the API call fails, or the response is not in JSON format, the method prints an error message and returns None.
         """
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_series_id = {executor.submit(self.retrieve_single_series_all_releases, series_id): series_id
-                                   for series_id in series_ids}
-            for future in concurrent.futures.as_completed(future_to_series_id):
-                series_id = future_to_series_id[future]
-                try:
-                    data = future.result()
-                    if data is not None:
-                        results.append(data)
-                    else:
-                        print(f"Error fetching series ID {series_id}: No data returned.")
-                except Exception as exc:
-                    print(f"Series ID {series_id} generated an exception: {exc}")
-        if results:
-            return pd.concat(results, ignore_index=True)
-        else:
-            return pd.DataFrame()
-
-    @RateLimitDecorator(calls=calls_per_minute)
-    def retrieve_single_series_first_release(self, series_id):
+        return self._retrieve_concurrently(self.retrieve_single_series_all_releases, series_ids, job_dir=job_dir, sink=sink,
+                                           compact=compact, frequency=frequency, aggregation_method=aggregation_method,
+                                           units=units, observation_start=observation_start,
+                                           observation_end=observation_end, vintage_dates=vintage_dates,
+                                           vintage_schedule=vintage_schedule)
+
+    def retrieve_single_series_first_release(self, series_id, frequency=None, aggregation_method=None, units=None,
+                                             observation_start=None, observation_end=None):
         """
         Retrieve that is leveraged by the retrieve_series_first_releases method to execute concurrent requests for
         series information by using the ThreadPoolExecutor for synchronous requests.
         """
-        df = self.retrieve_single_series_all_releases(series_id)
+        df = self.retrieve_single_series_all_releases(series_id, frequency=frequency,
+                                                      aggregation_method=aggregation_method, units=units,
+                                                      observation_start=observation_start,
+                                                      observation_end=observation_end)
+        if df is None:
+            return None
         if not df.empty:
-            # Group by the observation date and take the first release for each group
-            first_release = df.groupby(['Reporting Date']).first().reset_index()
+            # Take the earliest published vintage of each observation date, whatever order the rows arrived in
+            first_release = nth_release(df, 0)
             # Select only the relevant columns and rename them
-            first_release = first_release[['Published Date', 'Reporting Date', 'Value', 'Series', 'Unique Key', 'Website URL', 'JSON URL']]
+            first_release = first_release[['Published Date', 'Reporting Date', 'Value', 'Series']
+                                          + (['Transform'] if 'Transform' in first_release else [])
+                                          + ['Unique Key', 'Website URL', 'JSON URL']]
             return first_release
         else:
             # If the DataFrame is empty, return it as is or handle the case as appropriate
             print(f"No data available for series {series_id}.")
             return df
 
-    def retrieve_series_first_release(self, series_ids):
+    def retrieve_series_first_release(self, series_ids, job_dir=None, sink=None, frequency=None,
+                                      aggregation_method=None, units=None, observation_start=None,
+                                      observation_end=None):
         """
         Retrieves the initial release data for a specified FRED series ID, focusing exclusively on the data as it was first published, and excluding any subsequent revisions. This method is particularly useful for analyses that require understanding the initial impact of economic indicators before any revisions are made, allowing for a comparison between initial estimates and later revised data.
 
@@ -555,6 +1451,13 @@ class FredBrain:
 
         Parameters:
         - series_id (str): The unique identifier for the desired FRED series, which specifies the particular dataset to be retrieved. This ID corresponds to a wide range of economic data series provided by the Federal Reserve Bank of St. Louis.
+        - job_dir (str, optional): A folder that turns the call into a resumable job. Progress is recorded in a manifest inside the folder and each finished series is flushed as soon as it arrives, so re-running the same call skips every series completed before a failure.
+        - sink (callable, optional): Called as sink(series_id, data_frame) for every finished series instead of keeping it in memory, e.g. lambda series_id, df: db_manager.insert_new_rows(df, 'AllReleases'). When a sink is given an empty DataFrame is returned.
+        - frequency (str, optional): Have FRED aggregate the observations to a lower frequency, e.g. 'm', 'q' or 'a', instead of downloading native-frequency points.
+        - aggregation_method (str, optional): How observations are aggregated to `frequency`: 'avg' (FRED's default), 'sum' or 'eop'.
+        - units (str, optional): Have FRED transform the values, e.g. 'pch' (percent change), 'pc1' (percent change from a year ago) or 'log'. When any of frequency, aggregation_method or units is given, the frame gets a 'Transform' column such as 'frequency=m&units=pch' and the transform becomes part of the 'Unique Key', so transformed rows never collide with raw ones.
+        - observation_start (str, optional): The first observation date to retrieve, as YYYY-MM-DD.
+        - observation_end (str, optional): The last observation date to retrieve, as YYYY-MM-DD.
 
         Returns:
         - pandas.DataFrame: A structured DataFrame that includes three key columns: 'Published Date' (indicating when the data was first released), 'Reporting Date' (the date to which the data pertains), and 'Value' (the initial value as first reported). This DataFrame facilitates direct analysis and comparison of initial economic data releases.
@@ -570,31 +1473,102 @@ class FredBrain:
         - The method assumes the availability of a comprehensive dataset for the specified series ID, spanning all releases. In scenarios where no data is available or the series ID is incorrect, the method will indicate the absence of data accordingly.
         - This approach is particularly valuable in research contexts where the initial reaction to economic indicators is of interest, allowing for a nuanced understanding of economic dynamics as perceived at different points in time.
         """
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-            future_to_series_id = {executor.submit(self.retrieve_single_series_first_release, series_id): series_id
-                                   for series_id in series_ids}
-            for future in concurrent.futures.as_completed(future_to_series_id):
-                series_id = future_to_series_id[future]
-                try:
-                    data = future.result()
-                    if data is not None:
-                        results.append(data)
-                    else:
-                        print(f"Error fetching series ID {series_id}: No data returned.")
-                except Exception as exc:
-                    print(f"Series ID {series_id} generated an exception: {exc}")
-        if results:
-            return pd.concat(results, ignore_index=True)
+        return self._retrieve_concurrently(self.retrieve_single_series_first_release, series_ids, job_dir=job_dir, sink=sink,
+                                           frequency=frequency, aggregation_method=aggregation_method, units=units,
+                                           observation_start=observation_start, observation_end=observation_end)
+
+    def sync_series(self, series_ids, state_path, release='latest', sink=None, use_updates_feed=True):
+        """
+        Brings stored observations up to date by re-downloading only the series that FRED reports as changed.
+
+        The 'last_updated' stamp of every series is kept in a SyncState file at `state_path`. On each run the current
+        stamps are taken from the series/updates feed, covering everything updated since the requested series were last
+        checked in a few paged calls, and series that were never stored or fall outside the feed's two-week window are looked up
+        individually. Observations are then retrieved only for series whose stamp changed. Series that fail to
+        download are dropped from the state so they are retried on the next run.
+
+        Parameters:
+        - series_ids (list of str): The series to keep in sync.
+        - state_path (str): Path of the JSON file holding the stored 'last_updated' stamps.
+        - release (str, optional): Which observations to retrieve for changed series: 'latest' (default), 'all' or
+          'first', matching the retrieve_series_* methods.
+        - sink (callable, optional): Called as sink(series_id, data_frame) for every refreshed series instead of
+          returning the data, e.g. lambda series_id, df: db_manager.insert_new_rows(df, 'LatestReleases').
+        - use_updates_feed (bool, optional): Use the series/updates feed when the previous sync is recent enough.
+          When False, every series' metadata is fetched individually, which still avoids most observation downloads.
+
+        Returns:
+        - pandas.DataFrame: The observations of the series that changed, or an empty DataFrame if nothing changed
+          or a sink was given.
+
+        Usage:
+            fred = FredBrain(fred_api_key="your_fred_api_key")
+            changed = fred.sync_series(series_list, "state/latest_releases.json")
+            db_manager.insert_new_rows(changed, "LatestReleases")
+        """
+        retrieve_single = {
+            'latest': self.retrieve_single_series_latest_release,
+            'all': self.retrieve_single_series_all_releases,
+            'first': self.retrieve_single_series_first_release,
+        }.get(release)
+        if retrieve_single is None:
+            raise ValueError("release must be one of 'latest', 'all' or 'first'.")
+        sync_started = datetime.now()
+        state = SyncState(state_path)
+        series_ids = list(dict.fromkeys(str(series_id) for series_id in series_ids))
+        current = {}
+        feed_window = timedelta(days=self.updates_window_days - 1)
+        known = [series_id for series_id in series_ids if series_id in state.last_updated]
+        # The feed must reach back to the series checked longest ago, not just to the latest sync of any subset
+        oldest_check = state.oldest_check(known)
+        if use_updates_feed and oldest_check is not None and sync_started - oldest_check < feed_window:
+            # The feed's time zone is not documented, so the window is widened by a day on both sides
+            updates = self.fetch_series_updates(start_time=oldest_check - timedelta(days=1),
+                                                end_time=sync_started + timedelta(days=1),
+                                                max_pages=max(len(known), 1))
+            if updates is not None:
+                feed = dict(zip(updates['id'], updates['last_updated'])) if not updates.empty else {}
+                for series_id in known:
+                    current[series_id] = feed.get(series_id, state.last_updated[series_id])
+        lookup = [series_id for series_id in series_ids if series_id not in current]
+        # A cached stamp is good enough for series that were never stored, but stored series must be checked against
+        # FRED itself or a stale cache could hide a change
+        new = [series_id for series_id in lookup if series_id not in state.last_updated]
+        stored = [series_id for series_id in lookup if series_id in state.last_updated]
+        for series_list, refresh in ((new, False), (stored, True)):
+            if series_list:
+                info = self.fetch_series_info(series_list, ['id', 'frequency', 'units', 'last_updated'], refresh=refresh)
+                if 'last_updated' in info:
+                    info = info.dropna(subset=['last_updated'])
+                    current.update(zip(info['id'], info['last_updated']))
+        changed = state.changed(current)
+        print(f"{len(changed)} of {len(series_ids)} series changed since the last sync.")
+        frames = []
+        completed = {}
+
+        def record(series_id, data):
+            if sink is not None:
+                sink(series_id, data)
+            else:
+                frames.append(data)
+            completed[series_id] = current[series_id]
+
+        if changed:
+            self._retrieve_concurrently(retrieve_single, changed, sink=record)
+        failed = [series_id for series_id in changed if series_id not in completed]
+        state.forget(failed)
+        state.update(completed, sync_started, checked=[series_id for series_id in current if series_id not in failed])
+        state.save()
+        if frames:
+            return pd.concat(frames, ignore_index=True)
         else:
             return pd.DataFrame()
 
-    @RateLimitDecorator(calls=calls_per_minute)
     def get_single_website_url(self, series_id):
         url = "%s/series/observations?series_id=%s&api_key=%s&file_type=json" % (
             self.root_url, series_id, self.fred_api_key)
         url_website = "https://fred.stlouisfed.org/series/%s" % series_id
-        response_api = requests.get(url)
+        response_api = self._request(url)
         if response_api.status_code == 200:
             try:
                 return url_website
@@ -607,49 +1581,172 @@ class FredBrain:
             print("Response content:", response_api.text)
             return None
 
-    def _summarize_dataframe(self, data_frame):
+    def _summarize_dataframe(self, data_frame, token_budget=None):
         """
         Helper method to convert a DataFrame into a summarized text format that ChatGPT can understand.
 
+        Instead of the full data, the summary holds per-series statistics and trends, the largest moves, and evenly
+        spaced observations, thinned out until it fits the token budget (see Summarize.summarize_frame).
+
         Parameters:
         - data_frame (pandas.DataFrame): The DataFrame to summarize.
+        - token_budget (int, optional): The size of the summary in tokens. Defaults to `summary_token_budget`.
 
         Returns:
         - str: A string summary of the DataFrame.
         """
-        # Implement a method to summarize the DataFrame as needed, this could be a simple CSV conversion,
-        # or more complex text summarization depending on the context and the need.
-        # This is just a placeholder for the actual implementation.
-        return data_frame.to_csv()
+        return summarize_frame(data_frame, token_budget or self.summary_token_budget)
 
-    def analyze_with_chatgpt(self, data_frame, question):
+    def _openai(self):
+        """
+        Returns the client analyses are sent to, creating it on first use.
+        """
+        if self.openai_client is None:
+            self.openai_client = openai.OpenAI(api_key=self.openai_api_key, base_url=self.openai_base_url)
+        return self.openai_client
+
+    def _chat(self, content):
+        response = self._openai().chat.completions.create(
+            model=self.openai_model,
+            messages=[
+                {"role": "system",
+                 "content": "You are an expert level economist trained to analyze and present conclusions based on economic and financial data."},
+                {"role": "user", "content": content}
+            ]
+        )
+        return response.choices[0].message.content
+
+    def analyze_with_chatgpt(self, data_frame, question, token_budget=None):
         """
         Uses OpenAI's ChatGPT to analyze a pandas DataFrame.
 
+        The DataFrame is summarized to fit `token_budget` tokens. If it does not fit even after thinning out the
+        observations, it is split by series into chunks that do, the question is answered for every chunk
+        concurrently, and the partial answers are combined into one answer by a final call.
+
         Parameters:
         - data_frame (pandas.DataFrame): The DataFrame to analyze.
         - question (str): A question or prompt for ChatGPT related to the analysis of the DataFrame.
+        - token_budget (int, optional): The size of each data summary in tokens. Defaults to `summary_token_budget`.
 
         Returns:
         - str: The response from ChatGPT.
         """
-        # Convert the DataFrame to a format that can be understood by ChatGPT (e.g., CSV, text summary, etc.)
-        data_summary = self._summarize_dataframe(data_frame)
-
-        # Ensure your OpenAI API key is set in your environment variables or set it directly
-        openai.api_key = self.openai_api_key
-        # Send the question and the data summary to ChatGPT
+        # Convert the DataFrame to a summary that fits the budget, in as many chunks as needed
+        chunks = summarize_chunks(data_frame, token_budget or self.summary_token_budget)
         try:
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",  # Or another model version
-                messages=[
-                    {"role": "system",
-                     "content": "You are an expert level economist trained to analyze and present conclusions based on economic and financial data."},
-                    {"role": "user", "content": f"{question}\n\n{data_summary}"}
-                ]
-            )
-            # Return the text response
-            return response['choices'][0]['message']['content']
+            return self._analyze_chunks(chunks, question)
         except Exception as e:  # General exception handling, consider specifying the exception
             print("An error occurred while querying the OpenAI API:", e)
             return None
+
+    def _analyze_chunks(self, chunks, question, partials=None, parallel=True):
+        """
+        Answers `question` for the summarized data in `chunks`, combining per-chunk answers if there are several.
+        Errors from the OpenAI API are raised.
+
+        Per-chunk answers are stored in `partials` (chunk index to answer) as they arrive, so a caller that retries
+        after an error can pass the same dict and only the chunks that failed are sent again. With `parallel=False`
+        the chunks are sent one after another, for callers that already run several analyses at the same time.
+        """
+        if len(chunks) == 1:
+            return self._chat(f"{question}\n\n{chunks[0]}")
+        partials = {} if partials is None else partials
+        missing = [index for index in range(len(chunks)) if index not in partials]
+        if missing:
+            print(f"Data does not fit the token budget, analysing {len(missing)} of its {len(chunks)} parts.")
+
+        def analyze_part(index):
+            return self._chat(f"{question}\n\nThis is one part of the data; other parts are analysed separately. "
+                              f"Answer for the series in this part.\n\n{chunks[index]}")
+
+        if parallel and len(missing) > 1:
+            error = None
+            with futures.ThreadPoolExecutor(max_workers=self.analysis_workers) as executor:
+                future_to_index = {executor.submit(analyze_part, index): index for index in missing}
+                for future in futures.as_completed(future_to_index):
+                    try:
+                        partials[future_to_index[future]] = future.result()
+                    except Exception as e:  # Kept until every part has finished, so the others are not lost
+                        error = error or e
+            if error is not None:
+                raise error
+        else:
+            for index in missing:
+                partials[index] = analyze_part(index)
+        combined = "\n\n".join(f"Part {index + 1}:\n{partials[index]}" for index in range(len(chunks)))
+        return self._chat(f"{question}\n\nThe data was analysed in {len(chunks)} parts. Combine these partial "
+                          f"analyses into one answer:\n\n{combined}")
+
+    def _analyze_with_retries(self, chunks, question, label):
+        """
+        Runs _analyze_chunks with the chunks sent one after another, retrying with jittered exponential backoff.
+        Answers of chunks that succeeded are kept across attempts, so a retry only re-sends the chunks that failed.
+        """
+        partials = {}
+        for attempt in range(self.analysis_retries + 1):
+            try:
+                return self._analyze_chunks(chunks, question, partials, parallel=False)
+            except Exception as e:  # General exception handling, consider specifying the exception
+                if attempt == self.analysis_retries:
+                    print(f"An error occurred while querying the OpenAI API for {label}:", e)
+                    return None
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                print(f"Analysis of {label} failed ({e}), retrying in {delay:.1f} seconds "
+                      f"(attempt {attempt + 1} of {self.analysis_retries}).")
+                time.sleep(delay)
+
+    def analyze_batch_with_chatgpt(self, analyses, cache_dir=None, max_workers=None, token_budget=None):
+        """
+        Runs many analyses with bounded concurrency, retrying failed calls and reusing cached answers.
+
+        Every (data_frame, question) pair is summarized as in analyze_with_chatgpt. Each worker sends the chunks of
+        its analysis one after another, so at most `max_workers` requests are in flight. With a `cache_dir`, answers
+        are stored under a hash of the model, the question and the summary, so a nightly report only queries the
+        model for the frames whose data changed since the last run. Failed calls are retried up to
+        `analysis_retries` times with jittered exponential backoff; only the chunks that failed are sent again.
+
+        Parameters:
+        - analyses (list or dict): (data_frame, question) pairs, or a dict mapping names to such pairs.
+        - cache_dir (str, optional): A folder for cached answers (see AnalysisCache). Without it nothing is cached.
+        - max_workers (int, optional): The number of analyses run at the same time. Defaults to `analysis_workers`.
+        - token_budget (int, optional): The size of each data summary in tokens. Defaults to `summary_token_budget`.
+
+        Returns:
+        - list or dict: The answers, in the order of `analyses` or keyed by the same names. An analysis that failed
+          after all retries has the answer None.
+
+        Usage:
+            report = fred.analyze_batch_with_chatgpt({
+                "unemployment": (unrate_df, "Summarize the labour market trend."),
+                "inflation": (cpi_df, "Is inflation accelerating?"),
+            }, cache_dir="cache/analyses")
+        """
+        named = analyses if isinstance(analyses, dict) else dict(enumerate(analyses))
+        cache = AnalysisCache(cache_dir) if cache_dir else None
+        budget = token_budget or self.summary_token_budget
+        answers = {}
+        pending = {}
+        for name, (data_frame, question) in named.items():
+            chunks = summarize_chunks(data_frame, budget)
+            key = AnalysisCache.key(self.openai_model, question, chunks)
+            cached = cache.get(key) if cache else None
+            if cached is not None:
+                answers[name] = cached
+            else:
+                pending[name] = (chunks, question, key)
+        print(f"{len(answers)} analyses answered from the cache, {len(pending)} sent to the model.")
+
+        def analyze(name):
+            chunks, question, key = pending[name]
+            answer = self._analyze_with_retries(chunks, question, name)
+            if cache and answer is not None:
+                cache.put(key, answer, self.openai_model, question)
+            return answer
+
+        with futures.ThreadPoolExecutor(max_workers=max_workers or self.analysis_workers) as executor:
+            for name, answer in zip(pending, executor.map(analyze, pending)):
+                answers[name] = answer
+        if isinstance(analyses, dict):
+            return {name: answers[name] for name in named}
+        return [answers[index] for index in range(len(analyses))]
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class JobManifest:
+    """
+    A durable, append-only record of per-series progress for a bulk ingestion job.
+
+    Each finished or failed series is appended to the manifest file as one JSON line and flushed to disk before the
+    call returns, so a crash never loses more than the series that were in flight. Re-opening the same manifest
+    replays the journal, which lets a restarted job skip every series that was already completed.
+
+    Attributes:
+    - path (str): Location of the manifest file. Parent folders are created if needed.
+    - job (str, optional): A name for the job, e.g. the retrieval method. Opening an existing manifest that was
+      written for a different job raises a ValueError so two jobs cannot share progress by accident.
+
+    Usage:
+        manifest = JobManifest("jobs/all_releases/manifest.jsonl", job="retrieve_single_series_all_releases")
+        todo = manifest.pending(series_ids)
+        manifest.mark_complete("UNRATE", rows=912, watermark="2024-04-05")
+    """
+    def __init__(self, path, job=None):
+        self.path = path
+        self.job = job
+        self.series = {}
+        self.lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if os.path.exists(path):
+            self._replay()
+        else:
+            self._append({'event': 'created', 'job': job})
+
+    def _replay(self):
+        with open(self.path, 'r', encoding='utf-8') as manifest_file:
+            lines = manifest_file.read().split('\n')
+        if lines[-1]:
+            # Terminate a torn final line so the next entry starts on a line of its own
+            with open(self.path, 'a', encoding='utf-8') as manifest_file:
+                manifest_file.write('\n')
+        for line in lines:
+            if line:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write is ignored; that series simply runs again
+                    continue
+                if entry.get('event') == 'created':
+                    if self.job is not None and entry.get('job') not in (None, self.job):
+                        raise ValueError(f"Manifest {self.path} belongs to job '{entry.get('job')}', not '{self.job}'.")
+                elif 'series' in entry:
+                    self.series[entry['series']] = entry
+
+    def _append(self, entry):
+        entry['recorded'] = datetime.now().isoformat(timespec='seconds')
+        with open(self.path, 'a', encoding='utf-8') as manifest_file:
+            manifest_file.write(json.dumps(entry, default=str) + '\n')
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+
+    def is_complete(self, series_id):
+        entry = self.series.get(str(series_id))
+        return entry is not None and entry['event'] == 'complete'
+
+    def pending(self, series_ids):
+        """
+        Returns the series IDs from `series_ids` that have not been completed yet, preserving their order.
+        """
+        return [series_id for series_id in series_ids if not self.is_complete(series_id)]
+
+    def completed(self):
+        return [series_id for series_id, entry in self.series.items() if entry['event'] == 'complete']
+
+    def watermark(self, series_id):
+        """
+        Returns the watermark recorded when `series_id` was last completed, or None.
+        """
+        entry = self.series.get(str(series_id))
+        return entry.get('watermark') if entry else None
+
+    def mark_complete(self, series_id, rows=0, watermark=None):
+        """
+        Records that all data for `series_id` has been handed to the sink. `watermark` is typically the latest
+        'Published Date' that was stored, so later incremental runs know where the stored data ends.
+        """
+        entry = {'event': 'complete', 'series': str(series_id), 'rows': int(rows), 'watermark': watermark}
+        with self.lock:
+            self._append(entry)
+            self.series[entry['series']] = entry
+
+    def mark_failed(self, series_id, error):
+        entry = {'event': 'failed', 'series': str(series_id), 'error': str(error)}
+        with self.lock:
+            self._append(entry)
+            self.series[entry['series']] = entry
+
+    def summary(self):
+        """
+        Returns a dictionary counting the series in each state, e.g. {'complete': 950, 'failed': 3}.
+        """
+        counts = {}
+        for entry in self.series.values():
+            counts[entry['event']] = counts.get(entry['event'], 0) + 1
+        return counts
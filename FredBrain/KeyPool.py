@@ -0,0 +1,151 @@
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+try:
+    from .RateLimit import RateLimitDecorator
+    from .Scheduler import RequestScheduler
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from RateLimit import RateLimitDecorator
+    from Scheduler import RequestScheduler
+
+
+class PooledKey:
+    """
+    One API key of a KeyPool with its own rate limiter, scheduler and usage counters.
+    """
+    def __init__(self, key, rate_limiter, scheduler):
+        self.key = key
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.calls = 0
+        self.throttled = 0
+        self.failures = 0
+        self.revoked = False
+        self.cooling_until = 0.0
+        self.recent = deque()
+
+    @property
+    def label(self):
+        # Only the end of the key is shown in reports and messages
+        return f"...{self.key[-4:]}" if self.key else str(self.key)
+
+
+class KeyPool:
+    """
+    Spreads requests over several FRED API keys, each with its own rate budget.
+
+    Every key gets a RateLimitDecorator bucket and a RequestScheduler of its own, so total throughput grows with
+    the number of keys. Each request goes to the usable key with the fewest calls in the current rate window, which
+    keeps the keys evenly loaded. A key that answers 429 is rested for `throttle_cooldown` seconds, and a key that
+    FRED rejects as invalid is taken out of the pool; in both cases the request is retried on another key.
+
+    Attributes:
+    - throttle_cooldown (float): Seconds a throttled key is avoided while other keys are usable.
+    - keys (list): The PooledKey entries.
+
+    Usage:
+        fred = FredBrain(fred_api_key=["key_one", "key_two", "key_three"])
+        fred.retrieve_series_all_releases(series_list)
+        print(fred.key_usage())
+    """
+    throttle_cooldown = 60.0
+
+    def __init__(self, keys, calls, period=60, backend=None, schedulers=None, schedulers_lock=None):
+        self.period = period
+        self.lock = threading.Lock()
+        schedulers = schedulers if schedulers is not None else {}
+        schedulers_lock = schedulers_lock or threading.Lock()
+        self.keys = []
+        for key in dict.fromkeys(keys):
+            # The budget is keyed by a hash of the API key, so the key itself is never written to a shared backend
+            rate_limiter = RateLimitDecorator(calls=calls, period=period, backend=backend,
+                                              bucket=hashlib.sha256(str(key).encode()).hexdigest()[:16])
+            with schedulers_lock:
+                scheduler = schedulers.setdefault(rate_limiter.bucket, RequestScheduler())
+            self.keys.append(PooledKey(key, rate_limiter, scheduler))
+
+    @staticmethod
+    def with_key(url, key):
+        """
+        Returns `url` with its api_key query parameter set to `key`.
+        """
+        if re.search(r'[?&]api_key=', url):
+            return re.sub(r'([?&]api_key=)[^&#]*', lambda match: match.group(1) + str(key), url)
+        return f"{url}{'&' if '?' in url else '?'}api_key={key}"
+
+    def _window_calls(self, pooled, now):
+        while pooled.recent and now - pooled.recent[0] >= self.period:
+            pooled.recent.popleft()
+        return len(pooled.recent)
+
+    def choose(self):
+        """
+        Picks the key for the next request and counts the call against it.
+
+        Raises:
+        - RuntimeError: If every key in the pool has been revoked.
+        """
+        with self.lock:
+            now = time.time()
+            usable = [pooled for pooled in self.keys if not pooled.revoked]
+            if not usable:
+                raise RuntimeError("Every FRED API key in the pool has been rejected.")
+            rested = [pooled for pooled in usable if pooled.cooling_until <= now]
+            candidates = rested or [min(usable, key=lambda pooled: pooled.cooling_until)]
+            pooled = min(candidates, key=lambda candidate: self._window_calls(candidate, now))
+            pooled.recent.append(now)
+            pooled.calls += 1
+            return pooled
+
+    def mark_throttled(self, pooled):
+        """
+        Rests a key that was answered with 429. Returns True if another key can take over right away.
+        """
+        with self.lock:
+            pooled.throttled += 1
+            pooled.cooling_until = time.time() + self.throttle_cooldown
+            print(f"API key {pooled.label} was throttled, resting it for {self.throttle_cooldown:.0f} seconds.")
+            return any(not other.revoked and other.cooling_until <= time.time() for other in self.keys)
+
+    def mark_revoked(self, pooled):
+        """
+        Takes a key that FRED rejected out of the pool. Returns True if other keys remain. The last usable key is
+        never taken out, so a single misconfigured key keeps producing FRED's error responses.
+        """
+        with self.lock:
+            if not any(not other.revoked for other in self.keys if other is not pooled):
+                return False
+            pooled.revoked = True
+            print(f"API key {pooled.label} was rejected by FRED and is no longer used.")
+            return True
+
+    def mark_failure(self, pooled):
+        with self.lock:
+            pooled.failures += 1
+
+    @staticmethod
+    def is_rejected_key(response):
+        """
+        Tells whether a response means the API key itself was refused, rather than the request.
+        """
+        if response.status_code in (401, 403):
+            return True
+        return response.status_code == 400 and 'api_key' in str(getattr(response, 'text', ''))
+
+    def usage(self):
+        """
+        Returns one dict per key with its state, total calls, calls in the current window, 429 responses and
+        failed requests.
+        """
+        with self.lock:
+            now = time.time()
+            return [{
+                'Key': pooled.label,
+                'State': 'revoked' if pooled.revoked else 'resting' if pooled.cooling_until > now else 'active',
+                'Calls': pooled.calls,
+                'Window Calls': self._window_calls(pooled, now),
+                'Throttled': pooled.throttled,
+                'Failures': pooled.failures,
+            } for pooled in self.keys]
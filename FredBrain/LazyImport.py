@@ -0,0 +1,43 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    A placeholder for a module that is only imported the first time one of its attributes is used.
+
+    Importing FredBrain should be cheap for short-lived jobs that never touch pandas, requests or OpenAI, so the
+    heavy dependencies are bound to LazyModule instances at module level and resolved on first attribute access.
+    Attribute reads and writes are forwarded to the real module once it has been imported.
+
+    Attributes:
+    - name (str): The fully qualified name of the module to import, e.g. 'concurrent.futures'.
+
+    Usage:
+        pd = LazyModule('pandas')
+        df = pd.DataFrame()  # pandas is imported here, not at module import time
+    """
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, '_module', module)
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule '{self._name}' ({state})>"
@@ -1,11 +1,27 @@
+import hashlib
+import os
+import re
 import mysql.connector
+import numpy as np
 import pandas as pd
 from mysql.connector import Error
 import time
+try:
+    from .Revisions import compact_releases, _same_values
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from Revisions import compact_releases, _same_values
 
 
 class MySQLBrain:
-    def __init__(self, host, user, passwd, db_name=None, ssl_verify_identity=None, ssl_ca=None):
+    # Series whose stored keys are fetched per query when pre-filtering insert_new_rows
+    key_query_series = 500
+    # Columns of the first and latest release summary tables, after `Series` and `Reporting Date`
+    summary_columns = ('Published Date', 'Value', 'Unique Key', 'Website URL', 'JSON URL')
+    vintage_index_name = 'fredbrain_vintage'
+    # Records which vintage tables feed which summary tables, so every process keeps the summaries current
+    summary_registry_table = 'fredbrain_release_summaries'
+
+    def __init__(self, host, user, passwd, db_name=None, ssl_verify_identity=None, ssl_ca=None, key_cache_dir=None):
         """
         Initializes a new instance of the SQLBrain class.
 
@@ -16,6 +32,8 @@ class MySQLBrain:
         - db_name (str, optional): The name of the database to connect to. If not specified,
           the connection will be established without selecting a database. From there, you can
           use the create or view database functions
+        - key_cache_dir (str, optional): A folder where the stored-key sets used by insert_new_rows are kept between
+          runs, one file per table. Without it the sets only live as long as this instance.
 
         The constructor establishes a connection to the MySQL server and initializes a cursor
         for executing database operations. If a database name is provided, the connection
@@ -29,6 +47,13 @@ class MySQLBrain:
         self.ssl_ca = ssl_ca
         self.conn = None
         self.cursor = None
+        self.key_cache_dir = key_cache_dir
+        # {table_name: {series: sorted uint64 fingerprints of the stored 'Unique Key' values}}
+        self.key_cache = {}
+        # {vintage table: (first release table, latest release table)}, read from summary_registry_table on first use
+        self.release_summaries = None
+        # Vintage tables known to carry the index added by _ensure_vintage_index
+        self.indexed_tables = set()
         self.connect()
 
     def connect(self):
@@ -202,6 +227,9 @@ class MySQLBrain:
         executes this statement in batch mode for all rows in the provided DataFrame, inserting the data
         into the specified table.
 
+        If `table_name` is a vintage table with release summary tables (see maintain_release_summaries), the
+        summaries of the inserted series are refreshed afterwards, as insert_new_rows does.
+
         Outputs:
         - Prints a message indicating successful data insertion.
 
@@ -239,6 +267,8 @@ class MySQLBrain:
                     f"All data inserted successfully into '{table_name}'. Total rows inserted: {total_rows_inserted}.")
             else:
                 print(f"Inserted {total_rows_inserted} out of {len(df)} rows into '{table_name}'.")
+        if total_rows_inserted and table_name in self._release_summaries():
+            self._refresh_release_summaries(table_name, series_ids=df['Series'].unique().tolist())
 
     def fred_create_table_sql(self, df, table_name):
         """
@@ -303,7 +333,94 @@ class MySQLBrain:
         else:
             print(f"Table '{table_name}' already exists.")
 
-    def insert_new_rows(self, df, table_name, chunk_size=10000):
+    @staticmethod
+    def _key_fingerprints(keys):
+        """
+        Maps 'Unique Key' values to 64-bit fingerprints. The keys produced by transform_series are SHA-256 hex
+        digests, whose first 16 hex digits are used directly; any other key is hashed first.
+        """
+        keys = [str(key) for key in keys]
+        prefixes = ''.join(key[:16] for key in keys)
+        if len(prefixes) == 16 * len(keys) and re.fullmatch('[0-9a-fA-F]*', prefixes):
+            return np.frombuffer(bytes.fromhex(prefixes), dtype='>u8').astype(np.uint64)
+        return np.array([int(key[:16], 16) if re.fullmatch('[0-9a-fA-F]{16}', key[:16]) else
+                         int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+                         for key in keys], dtype=np.uint64)
+
+    def _key_cache_path(self, table_name):
+        return os.path.join(self.key_cache_dir, f"{table_name}.keys.npz")
+
+    def _table_key_cache(self, table_name):
+        """
+        Returns the in-memory key sets of `table_name`, loading them from key_cache_dir on first use.
+        """
+        if table_name not in self.key_cache:
+            cache = {}
+            if self.key_cache_dir and os.path.exists(self._key_cache_path(table_name)):
+                stored = np.load(self._key_cache_path(table_name), allow_pickle=False)
+                offsets = stored['offsets']
+                for position, series in enumerate(stored['series']):
+                    cache[str(series)] = stored['keys'][offsets[position]:offsets[position + 1]]
+            self.key_cache[table_name] = cache
+        return self.key_cache[table_name]
+
+    def _save_key_cache(self, table_name):
+        if not self.key_cache_dir:
+            return
+        os.makedirs(self.key_cache_dir, exist_ok=True)
+        cache = self.key_cache[table_name]
+        series = sorted(cache)
+        sizes = [len(cache[name]) for name in series]
+        temp_path = self._key_cache_path(table_name) + '.tmp.npz'
+        np.savez(temp_path, series=np.array(series, dtype=str), offsets=np.concatenate([[0], np.cumsum(sizes)]),
+                 keys=np.concatenate([cache[name] for name in series]) if series else np.array([], dtype=np.uint64))
+        os.replace(temp_path, self._key_cache_path(table_name))
+
+    def clear_key_cache(self, table_name=None):
+        """
+        Forgets the stored-key sets of `table_name`, or of every table, in memory and in key_cache_dir. Call this
+        after deleting rows from a table outside of this class, otherwise insert_new_rows keeps skipping them.
+        """
+        for name in ([table_name] if table_name else list(self.key_cache)):
+            self.key_cache.pop(name, None)
+            if self.key_cache_dir and os.path.exists(self._key_cache_path(name)):
+                os.remove(self._key_cache_path(name))
+
+    def _filter_stored_rows(self, df, table_name):
+        """
+        Drops the rows of `df` whose 'Unique Key' is already stored in `table_name`.
+
+        Only the keys of the series present in `df` are fetched from the table, and only for series that are not in
+        the key cache yet; after that, checking a batch is a vectorized lookup in memory. Returns the new rows and
+        their fingerprints, or None if the stored keys could not be read.
+        """
+        series_in_batch = df['Series'].unique().tolist()
+        if not series_in_batch:
+            # Nothing to look up, and np.concatenate below needs at least one array
+            return df, self._key_fingerprints(df['Unique Key'])
+        cache = self._table_key_cache(table_name)
+        fingerprints = self._key_fingerprints(df['Unique Key'])
+        missing = [series for series in series_in_batch if series not in cache]
+        for i in range(0, len(missing), self.key_query_series):
+            batch = missing[i:i + self.key_query_series]
+            placeholders = ', '.join(['%s' for _ in batch])
+            try:
+                self.cursor.execute(
+                    f"SELECT `Series`, `Unique Key` FROM `{table_name}` WHERE `Series` IN ({placeholders})", batch)
+                stored = pd.DataFrame(self.cursor.fetchall(), columns=['Series', 'Unique Key'])
+            except Error as e:
+                print(f"Failed to read stored keys from '{table_name}', uploading every row instead: {e}")
+                return None
+            stored['Fingerprint'] = self._key_fingerprints(stored['Unique Key'])
+            for series in batch:
+                cache[series] = np.array([], dtype=np.uint64)
+            for series, keys in stored.groupby('Series')['Fingerprint']:
+                cache[series] = np.unique(keys.to_numpy(dtype=np.uint64))
+        known = np.concatenate([cache[series] for series in series_in_batch])
+        is_new = ~np.isin(fingerprints, known)
+        return df[is_new], fingerprints[is_new]
+
+    def insert_new_rows(self, df, table_name, chunk_size=10000, prefilter=True):
         """
           Inserts new rows into a specified table in the MySQL database, avoiding duplicates.
 
@@ -317,6 +434,10 @@ class MySQLBrain:
           - df (pandas.DataFrame): A DataFrame containing the new rows to insert. The DataFrame must include a 'hash_key'
             column, which serves as a unique identifier for each row. This 'hash_key' should be generated using a
             consistent hashing method to ensure uniqueness.
+          - prefilter (bool, optional): Drop rows whose key is already stored before uploading anything. The stored
+            keys are fetched once per series present in the batch and then kept as compact 64-bit fingerprints per
+            table and series (see key_cache_dir), so an incremental sync only uploads the rows that are really new.
+            Defaults to True.
 
           Outputs:
           - Console output indicating the success of the operation, including the number of rows inserted.
@@ -341,6 +462,15 @@ class MySQLBrain:
         # existing_df = pd.DataFrame(existing_rows, columns=df.columns.to_list())
         # print(len(existing_df))
         # print(existing_df)
+        new_fingerprints = None
+        if prefilter and {'Series', 'Unique Key'}.issubset(df.columns):
+            filtered = self._filter_stored_rows(df, table_name)
+            if filtered is not None:
+                print(f"{len(df) - len(filtered[0])} of {len(df)} rows are already stored in '{table_name}'.")
+                df, new_fingerprints = filtered
+                if df.empty:
+                    print(f"0 rows inserted successfully into '{table_name}'.")
+                    return
         print("Creating temporary SQL table")
         temp_table_name = f"temp_{table_name}"
         create_temp_table_sql = f"CREATE TABLE `{temp_table_name}` LIKE `{table_name}`;"
@@ -380,9 +510,16 @@ class MySQLBrain:
         rows_inserted = self.cursor.rowcount
         self.conn.commit()
         print(f"{rows_inserted} rows inserted successfully into '{table_name}'.")
+        if rows_inserted and table_name in self._release_summaries():
+            self._refresh_release_summaries(table_name, affected_table=temp_table_name)
         drop_temp_table_sql = f"DROP TABLE IF EXISTS `{temp_table_name}`;"
         self.cursor.execute(drop_temp_table_sql)
         self.conn.commit()
+        if new_fingerprints is not None:
+            cache = self.key_cache[table_name]
+            for series, keys in pd.Series(new_fingerprints, index=df['Series'].to_numpy()).groupby(level=0):
+                cache[series] = np.union1d(cache.get(series, np.array([], dtype=np.uint64)), keys.to_numpy())
+            self._save_key_cache(table_name)
         # unique_to_insert = (
         #     df
         #     .merge(existing_df[['Unique Key']], on="Unique Key", how='left', indicator=True)
@@ -419,6 +556,429 @@ class MySQLBrain:
         #         else:
         #             print(f"Inserted {total_rows_inserted} out of {len(df)} rows into '{table_name}'.")
 
+    def insert_compacted_releases(self, df, table_name, chunk_size=10000, tolerance=1e-6):
+        """
+        Inserts an all-releases DataFrame into a vintage table in compacted form, keeping only the vintages in which
+        a reporting date's value changed.
+
+        The incoming frame is compacted with Revisions.compact_releases. It is then compared with the latest stored
+        vintage of every affected series and reporting date. Incoming vintages that are already stored, or that
+        continue the latest stored vintage with the same value, are not inserted; instead that stored row's
+        'Validity Date' is extended. Everything else goes through insert_new_rows, including back-filled vintages
+        older than the latest stored one, and insert_new_rows skips the vintages whose 'Unique Key' is stored.
+        Repeated syncs of unchanged series therefore only move validity dates forward, and the table does not grow.
+
+        Parameters:
+        - df (pandas.DataFrame): A frame as returned by retrieve_series_all_releases, compacted or not.
+        - table_name (str): The vintage table, created with fred_create_table_sql from a compacted frame.
+        - chunk_size (int, optional): Rows per batch, passed on to insert_new_rows.
+        - tolerance (float, optional): Relative tolerance when comparing incoming values with stored ones. The default
+          absorbs the rounding of single-precision FLOAT columns.
+
+        Usage Example:
+        db_manager.insert_compacted_releases(fred.retrieve_series_all_releases(series_list, compact=True), 'AllReleaseVersion')
+        """
+        compacted = compact_releases(df)
+        if compacted.empty:
+            print("No rows to insert.")
+            return
+        self._ensure_vintage_index(table_name)
+        series_list = compacted['Series'].unique().tolist()
+        placeholders = ', '.join(['%s' for _ in series_list])
+        latest_query = f"""
+                SELECT stored.`Series`, stored.`Reporting Date`, stored.`Published Date`, stored.`Validity Date`,
+                       stored.`Value`, stored.`Unique Key`
+                FROM `{table_name}` AS stored
+                JOIN (
+                  SELECT `Series`, `Reporting Date`, MAX(`Published Date`) AS `Latest Published`
+                  FROM `{table_name}`
+                  WHERE `Series` IN ({placeholders})
+                  GROUP BY `Series`, `Reporting Date`
+                ) AS latest
+                ON stored.`Series` = latest.`Series`
+                  AND stored.`Reporting Date` = latest.`Reporting Date`
+                  AND stored.`Published Date` = latest.`Latest Published`;
+         """
+        try:
+            self.cursor.execute(latest_query, series_list)
+            stored = pd.DataFrame(self.cursor.fetchall(), columns=[
+                'Series', 'Reporting Date', 'Stored Published', 'Stored Validity', 'Stored Value', 'Stored Key'])
+        except Error as e:
+            print(f"Failed to read the latest stored vintages from '{table_name}': {e}")
+            return
+        for column in ('Reporting Date', 'Stored Published', 'Stored Validity'):
+            stored[column] = pd.to_datetime(stored[column])
+        stored['Stored Value'] = stored['Stored Value'].astype(float)
+        merged = compacted.merge(stored, on=['Series', 'Reporting Date'], how='left')
+        has_stored = merged['Stored Key'].notna().to_numpy()
+        published = merged['Published Date'].to_numpy()
+        stored_published = merged['Stored Published'].to_numpy()
+        newer = has_stored & (published > stored_published)
+        same_start = has_stored & (published == stored_published)
+        # Only the earliest newer vintage of a reporting date can continue the stored one
+        first_newer = np.zeros(len(merged), dtype=bool)
+        first_newer[merged[newer].drop_duplicates(['Series', 'Reporting Date']).index] = True
+        continues = (first_newer
+                     & _same_values(merged['Value'].to_numpy(dtype=float), merged['Stored Value'].to_numpy(dtype=float),
+                                    tolerance)
+                     & (published <= merged['Stored Validity'].to_numpy() + np.timedelta64(1, 'D')))
+        extend = merged[(same_start | continues) & (merged['Validity Date'] > merged['Stored Validity']).to_numpy()]
+        extensions = extend.groupby(['Series', 'Reporting Date', 'Stored Published'])['Validity Date'].max()
+        if not extensions.empty:
+            # Matched on the indexed (Series, Reporting Date, Published Date) rather than the unindexed TEXT key
+            update_stmt = (f"UPDATE `{table_name}` SET `Validity Date` = %s "
+                           f"WHERE `Series` = %s AND `Reporting Date` = %s AND `Published Date` = %s")
+            try:
+                self.cursor.executemany(update_stmt, [
+                    (validity.to_pydatetime(), series, reporting.to_pydatetime(), published.to_pydatetime())
+                    for (series, reporting, published), validity in extensions.items()])
+                self.conn.commit()
+                print(f"{len(extensions)} stored vintages extended in '{table_name}'.")
+            except Error as e:
+                print(f"Failed to extend stored vintages in '{table_name}': {e}")
+                return
+        # Everything that does not merely extend the latest stored vintage is inserted, including back-filled
+        # vintages older than it; insert_new_rows skips the ones whose 'Unique Key' is already stored
+        to_insert = merged.loc[~(same_start | continues), compacted.columns]
+        print(f"{len(compacted)} compacted vintages, {len(to_insert)} to insert after comparing with '{table_name}'.")
+        if not to_insert.empty:
+            self.insert_new_rows(to_insert, table_name, chunk_size)
+
+    def maintain_release_summaries(self, vintage_table, first_table='FirstReleases', latest_table='LatestReleases',
+                                   rebuild=None):
+        """
+        Keeps a first-release and a latest-release table derived from a vintage table, instead of loading them
+        separately from retrieve_series_first_release and retrieve_series_latest_release.
+
+        Both summary tables hold one row per `Series` and `Reporting Date`, which form their primary key. Afterwards,
+        every insert into `vintage_table` through this class (insert_new_rows, insert_compacted_releases,
+        fred_insert_into_table and fred_create_table_sql) recomputes the summary rows of the series it touched, and
+        only those, with INSERT ... SELECT ... ON DUPLICATE KEY UPDATE.
+        A revision therefore replaces the stored latest value in place rather than adding a row next to it, and only
+        the vintage table takes full-size writes. The pairing is stored in `summary_registry_table`, so later
+        processes keep the summaries current without calling this method again. Requires MySQL 8 for window
+        functions.
+
+        Parameters:
+        - vintage_table (str): The table filled from retrieve_series_all_releases.
+        - first_table (str, optional): The first-release table. Created if it does not exist. An existing table must
+          have a primary or unique key on (`Series`, `Reporting Date`); tables loaded with fred_create_table_sql do
+          not, and raise a ValueError.
+        - latest_table (str, optional): The latest-release table, with the same requirements.
+        - rebuild (bool, optional): Recompute both tables from the whole vintage table now. Defaults to doing so
+          only when a summary table had to be created.
+
+        Raises:
+        - ValueError: If an existing summary table has no unique key on (`Series`, `Reporting Date`). Upserts into
+          such a table would append rows instead of replacing them.
+
+        Usage Example:
+        db_manager.maintain_release_summaries('AllReleaseVersion')
+        db_manager.insert_new_rows(fred.retrieve_series_all_releases(series_list), 'AllReleaseVersion')
+        first_releases = db_manager.read_table('FirstReleases', series_ids=['GDP'])
+        """
+        created = False
+        for summary_table in (first_table, latest_table):
+            if self.check_table_exists(summary_table):
+                if not self._has_unique_key(summary_table, ('Series', 'Reporting Date')):
+                    raise ValueError(f"Table '{summary_table}' has no unique key on (`Series`, `Reporting Date`), so "
+                                     f"refreshing it would append rows. Drop or rename it, or pass other table names.")
+                continue
+            created = True
+            create_stmt = f"""
+                CREATE TABLE IF NOT EXISTS `{summary_table}` (
+                  `Series` VARCHAR(255) NOT NULL,
+                  `Reporting Date` DATETIME NOT NULL,
+                  `Published Date` DATETIME,
+                  `Value` FLOAT,
+                  `Unique Key` TEXT,
+                  `Website URL` TEXT,
+                  `JSON URL` TEXT,
+                  `sql_upload_datetime` TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                  PRIMARY KEY (`Series`, `Reporting Date`)
+                );
+             """
+            try:
+                self.cursor.execute(create_stmt)
+                self.conn.commit()
+            except Error as e:
+                print(f"Failed to create summary table '{summary_table}': {e}")
+                return
+        register_stmts = [
+            f"""
+                CREATE TABLE IF NOT EXISTS `{self.summary_registry_table}` (
+                  `Vintage Table` VARCHAR(255) NOT NULL PRIMARY KEY,
+                  `First Table` VARCHAR(255) NOT NULL,
+                  `Latest Table` VARCHAR(255) NOT NULL
+                );
+             """,
+            f"""
+                INSERT INTO `{self.summary_registry_table}` (`Vintage Table`, `First Table`, `Latest Table`)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE `First Table` = VALUES(`First Table`), `Latest Table` = VALUES(`Latest Table`);
+             """,
+        ]
+        try:
+            self.cursor.execute(register_stmts[0])
+            self.cursor.execute(register_stmts[1], (vintage_table, first_table, latest_table))
+            self.conn.commit()
+        except Error as e:
+            print(f"Failed to record the summary tables of '{vintage_table}': {e}")
+            return
+        self._release_summaries()[vintage_table] = (first_table, latest_table)
+        print(f"'{first_table}' and '{latest_table}' are maintained from '{vintage_table}'.")
+        if rebuild or (rebuild is None and created):
+            self._refresh_release_summaries(vintage_table)
+
+    def _table_indexes(self, table_name):
+        """
+        Returns {index name: (is unique, set of column names)} for the indexes of `table_name`.
+        """
+        self.cursor.execute(f"SHOW INDEX FROM `{table_name}`")
+        names = [column[0] for column in self.cursor.description]
+        indexes = {}
+        for row in self.cursor.fetchall():
+            index = dict(zip(names, row))
+            unique, columns = indexes.setdefault(index['Key_name'], (int(index['Non_unique']) == 0, set()))
+            columns.add(index['Column_name'])
+        return indexes
+
+    def _has_unique_key(self, table_name, columns):
+        """
+        Tells whether `table_name` has a primary or unique key made of exactly `columns`.
+        """
+        return any(unique and indexed == set(columns) for unique, indexed in self._table_indexes(table_name).values())
+
+    def _ensure_vintage_index(self, table_name):
+        """
+        Adds an index on (`Series`, `Reporting Date`, `Published Date`) to a vintage table that has none, so the
+        lookups and validity updates of insert_compacted_releases do not scan the whole table.
+        """
+        columns = {'Series', 'Reporting Date', 'Published Date'}
+        if table_name in self.indexed_tables:
+            return
+        try:
+            if not any(indexed == columns for _, indexed in self._table_indexes(table_name).values()):
+                print(f"Adding a (Series, Reporting Date, Published Date) index to '{table_name}'.")
+                self.cursor.execute(f"CREATE INDEX `{self.vintage_index_name}` ON `{table_name}` "
+                                    f"(`Series`(64), `Reporting Date`, `Published Date`)")
+                self.conn.commit()
+            self.indexed_tables.add(table_name)
+        except Error as e:
+            print(f"Failed to index '{table_name}', continuing without the index: {e}")
+
+    def _release_summaries(self):
+        """
+        Returns {vintage table: (first table, latest table)}, reading the pairings recorded by
+        maintain_release_summaries from the database on first use.
+        """
+        if self.release_summaries is None:
+            summaries = {}
+            try:
+                self.cursor.execute(f"SELECT `Vintage Table`, `First Table`, `Latest Table` "
+                                    f"FROM `{self.summary_registry_table}`")
+                summaries = {vintage: (first, latest) for vintage, first, latest in self.cursor.fetchall()}
+            except Error:
+                # No summary tables have been set up in this database
+                pass
+            self.release_summaries = summaries
+        return self.release_summaries
+
+    def _refresh_release_summaries(self, vintage_table, affected_table=None, series_ids=None):
+        """
+        Recomputes the first and latest release rows of `vintage_table` and upserts them into its summary tables.
+        With `affected_table`, only the series and reporting dates present in that table are recomputed; with
+        `series_ids`, only those series. Every path that writes to a vintage table calls this afterwards.
+        """
+        where, params = self._series_filter(series_ids)
+        scope = f"\n                  {where}" if where else ""
+        if affected_table is not None:
+            scope = f"""
+                  JOIN (SELECT DISTINCT `Series`, `Reporting Date` FROM `{affected_table}`) AS affected
+                    ON vintage.`Series` = affected.`Series` AND vintage.`Reporting Date` = affected.`Reporting Date`"""
+        columns = ('Series', 'Reporting Date') + self.summary_columns
+        column_names = ', '.join([f"`{column}`" for column in columns])
+        selected = ', '.join([f"vintage.`{column}`" for column in columns])
+        updates = ', '.join([f"`{column}` = ranked.`{column}`" for column in self.summary_columns])
+        for summary_table, order in zip(self._release_summaries()[vintage_table], ('ASC', 'DESC')):
+            upsert_stmt = f"""
+                INSERT INTO `{summary_table}` ({column_names})
+                SELECT {column_names} FROM (
+                  SELECT {selected}, ROW_NUMBER() OVER (
+                    PARTITION BY vintage.`Series`, vintage.`Reporting Date` ORDER BY vintage.`Published Date` {order}
+                  ) AS `Release Number`
+                  FROM `{vintage_table}` AS vintage{scope}
+                ) AS ranked
+                WHERE `Release Number` = 1
+                ON DUPLICATE KEY UPDATE {updates};
+             """
+            try:
+                self.cursor.execute(upsert_stmt, params)
+                self.conn.commit()
+            except Error as e:
+                print(f"Failed to refresh summary table '{summary_table}': {e}")
+                return
+            # MySQL counts an updated row twice and an unchanged one not at all
+            print(f"Summary table '{summary_table}' refreshed ({self.cursor.rowcount} rows affected).")
+
+    def _series_filter(self, series_ids):
+        """
+        Returns a WHERE clause restricting a query to `series_ids` and its parameters. Without series ids the whole
+        table is used.
+        """
+        if not series_ids:
+            return "", []
+        placeholders = ', '.join(['%s' for _ in series_ids])
+        return f"WHERE `Series` IN ({placeholders})", list(series_ids)
+
+    def _query_frame(self, query, params, date_columns=()):
+        """
+        Runs a SELECT query and returns its rows as a DataFrame named after the result columns.
+        """
+        try:
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+            df = pd.DataFrame(rows, columns=[column[0] for column in self.cursor.description])
+        except Error as e:
+            print(f"Failed to run query: {e}")
+            return pd.DataFrame()
+        for column in date_columns:
+            df[column] = pd.to_datetime(df[column])
+        return df
+
+    def read_table(self, table_name, series_ids=None, columns=None):
+        """
+        Reads a table back into a DataFrame.
+
+        Parameters:
+        - table_name (str): The table to read.
+        - series_ids (list, optional): Only read the rows of these series.
+        - columns (list, optional): Only read these columns. Defaults to every column.
+
+        Returns:
+        - pandas.DataFrame: The rows, or an empty DataFrame if the query failed.
+
+        Usage Example:
+        unrate = db_manager.read_table('LatestRelease', series_ids=['UNRATE'])
+        """
+        where, params = self._series_filter(series_ids)
+        selected = ', '.join([f"`{column}`" for column in columns]) if columns else '*'
+        return self._query_frame(f"SELECT {selected} FROM `{table_name}` {where}", params)
+
+    def nth_release_sql(self, table_name, n=0, series_ids=None):
+        """
+        Computes Revisions.nth_release inside MySQL, so only one row per series and reporting date leaves the server.
+        Requires MySQL 8 for window functions.
+
+        Parameters:
+        - table_name (str): A vintage table filled from retrieve_series_all_releases.
+        - n (int, optional): 0 for the first release (default), 1 for the first revision and so on. Negative values
+          count from the latest vintage.
+        - series_ids (list, optional): Restricts the query to these series.
+
+        Returns:
+        - pandas.DataFrame: One row per series and reporting date with the table's columns.
+
+        Usage Example:
+        first_releases = db_manager.nth_release_sql('AllReleaseVersion', 0, ['GDP', 'UNRATE'])
+        """
+        where, params = self._series_filter(series_ids)
+        order = 'ASC' if n >= 0 else 'DESC'
+        query = f"""
+                SELECT * FROM (
+                  SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY `Series`, `Reporting Date` ORDER BY `Published Date` {order}) AS `Release Number`
+                  FROM `{table_name}`
+                  {where}
+                ) AS ranked
+                WHERE `Release Number` = %s
+                ORDER BY `Series`, `Reporting Date`;
+         """
+        df = self._query_frame(query, params + [n + 1 if n >= 0 else -n],
+                               ['Reporting Date', 'Published Date', 'Validity Date'])
+        return df.drop(columns=['Release Number'], errors='ignore')
+
+    def release_as_of_lag_sql(self, table_name, days, series_ids=None):
+        """
+        Computes Revisions.release_as_of_lag inside MySQL: the latest vintage published on or before
+        'Reporting Date' + `days` for every series and reporting date. Requires MySQL 8 for window functions.
+
+        Parameters:
+        - table_name (str): A vintage table filled from retrieve_series_all_releases.
+        - days (int): The number of days after the reporting date at which the value is read.
+        - series_ids (list, optional): Restricts the query to these series.
+
+        Returns:
+        - pandas.DataFrame: One row per series and reporting date that had been published by then.
+
+        Usage Example:
+        known_after_90_days = db_manager.release_as_of_lag_sql('AllReleaseVersion', 90)
+        """
+        where, params = self._series_filter(series_ids)
+        lag_filter = "`Published Date` <= DATE_ADD(`Reporting Date`, INTERVAL %s DAY)"
+        where = f"{where} AND {lag_filter}" if where else f"WHERE {lag_filter}"
+        query = f"""
+                SELECT * FROM (
+                  SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY `Series`, `Reporting Date` ORDER BY `Published Date` DESC) AS `Release Number`
+                  FROM `{table_name}`
+                  {where}
+                ) AS ranked
+                WHERE `Release Number` = 1
+                ORDER BY `Series`, `Reporting Date`;
+         """
+        df = self._query_frame(query, params + [int(days)], ['Reporting Date', 'Published Date', 'Validity Date'])
+        return df.drop(columns=['Release Number'], errors='ignore')
+
+    def revision_summary_sql(self, table_name, series_ids=None):
+        """
+        Computes Revisions.revision_summary inside MySQL, returning the same columns. Requires MySQL 8 for window
+        functions. Pass the result to Revisions.series_revision_statistics for per-series figures.
+
+        Parameters:
+        - table_name (str): A vintage table filled from retrieve_series_all_releases.
+        - series_ids (list, optional): Restricts the query to these series.
+
+        Returns:
+        - pandas.DataFrame: One row per series and reporting date with first and latest release, revision size,
+          revision count and number of vintages.
+
+        Usage Example:
+        summary = db_manager.revision_summary_sql('AllReleaseVersion', ['GDP'])
+        """
+        where, params = self._series_filter(series_ids)
+        query = f"""
+                WITH ordered AS (
+                  SELECT `Series`, `Reporting Date`, `Published Date`, `Value`,
+                         ROW_NUMBER() OVER w AS `Release Number`,
+                         COUNT(*) OVER (PARTITION BY `Series`, `Reporting Date`) AS `Vintages`,
+                         LAG(`Value`) OVER w AS `Previous Value`
+                  FROM `{table_name}`
+                  {where}
+                  WINDOW w AS (PARTITION BY `Series`, `Reporting Date` ORDER BY `Published Date`)
+                )
+                SELECT `Series`, `Reporting Date`,
+                       MIN(`Published Date`) AS `First Published`,
+                       MAX(`Published Date`) AS `Latest Published`,
+                       MAX(CASE WHEN `Release Number` = 1 THEN `Value` END) AS `First Value`,
+                       MAX(CASE WHEN `Release Number` = `Vintages` THEN `Value` END) AS `Latest Value`,
+                       SUM(CASE WHEN `Release Number` > 1 AND NOT (`Value` <=> `Previous Value`) THEN 1 ELSE 0 END)
+                         AS `Revision Count`,
+                       COUNT(*) AS `Vintages`
+                FROM ordered
+                GROUP BY `Series`, `Reporting Date`
+                ORDER BY `Series`, `Reporting Date`;
+         """
+        df = self._query_frame(query, params, ['Reporting Date', 'First Published', 'Latest Published'])
+        if df.empty:
+            return df
+        for column in ('First Value', 'Latest Value'):
+            df[column] = df[column].astype(float)
+        df['Revision Count'] = df['Revision Count'].astype(int)
+        df['Revision'] = df['Latest Value'] - df['First Value']
+        return df[['Series', 'Reporting Date', 'First Published', 'Latest Published', 'First Value', 'Latest Value',
+                   'Revision', 'Revision Count', 'Vintages']]
+
     def close_connection(self):
         """
         Closes the connection to the MySQL server.
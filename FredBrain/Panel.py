@@ -0,0 +1,237 @@
+import json
+import os
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+
+def _rule_groups(rule, series, default):
+    """
+    Expands a rule given either as one value for every series or as a {series_id: rule} dict into
+    {rule: column positions}.
+    """
+    if not isinstance(rule, dict):
+        return {rule: np.arange(len(series))}
+    groups = {}
+    for position, series_id in enumerate(series):
+        groups.setdefault(rule.get(series_id, default), []).append(position)
+    return {key: np.asarray(positions) for key, positions in groups.items()}
+
+
+def _aggregate(cells, values, how):
+    """
+    Reduces `values` sorted by `cells` (and by date within a cell) to one value per distinct cell.
+
+    Returns:
+    - tuple: (distinct cells, aggregated values)
+    """
+    starts = np.flatnonzero(np.append(True, cells[1:] != cells[:-1]))
+    if how == 'last':
+        return cells[starts], values[np.append(starts[1:], len(values)) - 1]
+    if how == 'first':
+        return cells[starts], values[starts]
+    sums = np.add.reduceat(values, starts)
+    if how == 'sum':
+        return cells[starts], sums
+    if how == 'mean':
+        return cells[starts], sums / np.diff(np.append(starts, len(values)))
+    raise ValueError(f"Unknown resample rule '{how}'. Expected 'last', 'first', 'mean' or 'sum'.")
+
+
+def _fill(matrix, columns, fill, limit, chunk_columns=256):
+    """
+    Fills the gaps of `matrix[:, columns]` in place, forward ('ffill') or backward ('bfill'), carrying a value over
+    at most `limit` periods when a limit is given.
+
+    The columns are filled `chunk_columns` at a time and each chunk is written back before the next one is read, so
+    filling a memory-mapped matrix only ever holds a few chunk-sized arrays in memory.
+    """
+    if fill is None or fill == 'none' or len(columns) == 0:
+        return
+    if fill not in ('ffill', 'bfill'):
+        raise ValueError(f"Unknown fill rule '{fill}'. Expected 'ffill', 'bfill' or None.")
+    rows = np.arange(matrix.shape[0])[:, None]
+    for start in range(0, len(columns), chunk_columns):
+        chunk = columns[start:start + chunk_columns]
+        block = matrix[:, chunk]
+        if fill == 'bfill':
+            block = block[::-1]
+        source = np.maximum.accumulate(np.where(np.isnan(block), 0, rows), axis=0)
+        filled = np.take_along_axis(block, source, axis=0)
+        if limit is not None:
+            filled[rows - source > limit] = np.nan
+        matrix[:, chunk] = filled[::-1] if fill == 'bfill' else filled
+
+
+class Panel:
+    """
+    A dense, date-aligned panel of many FRED series: a float64 matrix with one row per period of a common calendar
+    and one column per series, plus the date and series index.
+
+    The long frames returned by retrieve_series_latest_release (one row per series and date) are placed straight into
+    the matrix with array indexing instead of a pandas pivot, so building a panel of thousands of series needs little
+    more memory than the matrix itself. Series of different frequencies are brought onto one calendar by a resample
+    rule (how several observations in one period are combined) and a fill rule (how periods without an observation
+    are filled). When a path is given the matrix is written to disk as a .npy file and can be memory-mapped back, so
+    model code only reads the rows and columns it slices.
+
+    Attributes:
+    - values (numpy.ndarray): The (dates x series) matrix, possibly a numpy.memmap. Missing values are NaN.
+    - dates (pandas.DatetimeIndex): The start of every period of the calendar.
+    - series (list): The series ids, in column order.
+    - freq (str): The pandas period frequency of the calendar, e.g. 'D', 'W', 'M', 'Q' or 'Y'.
+
+    Usage:
+        latest = fred.retrieve_series_latest_release(["GFDEBTN", "GDP", "CP", "CPIAUCSL"])
+        panel = Panel.build(latest, freq='Q', how='last', fill='ffill', limit=1, path="panels/quarterly")
+        panel = Panel.load("panels/quarterly")
+        debt_to_gdp = panel.column("GFDEBTN") / panel.column("GDP")
+    """
+    values_file = 'values.npy'
+    index_file = 'index.json'
+    # Columns filled per pass, which bounds the memory the fill needs on top of the matrix
+    fill_chunk_columns = 256
+
+    def __init__(self, values, dates, series, freq, path=None):
+        self.values = values
+        self.dates = pd.DatetimeIndex(dates)
+        self.series = list(series)
+        self.freq = freq
+        self.path = path
+        self.positions = {series_id: position for position, series_id in enumerate(self.series)}
+
+    @classmethod
+    def build(cls, df, freq='M', how='last', fill='ffill', limit=None, start=None, end=None, series=None, path=None):
+        """
+        Aligns a long frame of observations to a common calendar.
+
+        Parameters:
+        - df (pandas.DataFrame): A frame with 'Series', 'Reporting Date' and 'Value' columns, e.g. the output of
+          retrieve_series_latest_release. Observations with a missing value are ignored.
+        - freq (str, optional): The pandas period frequency of the calendar ('D', 'B', 'W', 'M', 'Q', 'Y', ...).
+          Defaults to 'M'. Dates are labelled with the start of their period, as FRED does.
+        - how (str or dict, optional): How the observations falling into one period are combined: 'last', 'first',
+          'mean' or 'sum'. A dict maps series ids to rules; series not in it use 'last'. Defaults to 'last'.
+        - fill (str or dict, optional): How periods without an observation are filled: 'ffill', 'bfill' or None.
+          A dict maps series ids to rules; series not in it use 'ffill'. Defaults to 'ffill'.
+        - limit (int, optional): The largest number of consecutive periods a value is carried into. Defaults to no
+          limit.
+        - start, end (str or datetime, optional): The calendar's range. Defaults to the range of the observations.
+        - series (list, optional): The columns of the panel, in order. Defaults to the sorted series ids in `df`.
+        - path (str, optional): A folder to write the panel to. The matrix is then built directly in a memory-mapped
+          file instead of in memory.
+
+        Returns:
+        - Panel: The aligned panel.
+        """
+        observations = df[['Series', 'Reporting Date', 'Value']]
+        observations = observations[observations['Value'].notna()]
+        if series is None:
+            series = sorted(observations['Series'].unique())
+        positions = pd.Index(series)
+        reporting = pd.DatetimeIndex(pd.to_datetime(observations['Reporting Date']))
+        periods = reporting.to_period(freq)
+        first = pd.Period(start, freq=freq) if start is not None else periods.min()
+        last = pd.Period(end, freq=freq) if end is not None else periods.max()
+        calendar = pd.period_range(first, last, freq=freq)
+        rows = periods.asi8 - first.ordinal
+        columns = positions.get_indexer(observations['Series'])
+        inside = (rows >= 0) & (rows < len(calendar)) & (columns >= 0)
+        rows, columns = rows[inside], columns[inside]
+        values = observations['Value'].to_numpy(dtype=float)[inside]
+        dates = reporting.asi8[inside]
+
+        shape = (len(calendar), len(series))
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            matrix = np.lib.format.open_memmap(os.path.join(path, cls.values_file), mode='w+', dtype=np.float64,
+                                               shape=shape)
+            matrix[:] = np.nan
+        else:
+            matrix = np.full(shape, np.nan)
+
+        for rule, group in _rule_groups(how, series, 'last').items():
+            selected = np.isin(columns, group)
+            cells = rows[selected] * len(series) + columns[selected]
+            # Sort by cell, and by date within a cell so that 'first' and 'last' follow the calendar
+            order = np.lexsort((dates[selected], cells))
+            cells, aggregated = _aggregate(cells[order], values[selected][order], rule)
+            matrix.flat[cells] = aggregated
+        for rule, group in _rule_groups(fill, series, 'ffill').items():
+            _fill(matrix, group, rule, limit, cls.fill_chunk_columns)
+
+        panel = cls(matrix, calendar.to_timestamp(how='start'), series, freq, path)
+        if path is not None:
+            matrix.flush()
+            panel._write_index()
+        return panel
+
+    def _write_index(self):
+        index = {
+            'freq': self.freq,
+            'dates': [date.strftime('%Y-%m-%d') for date in self.dates],
+            'series': self.series,
+        }
+        temp_path = os.path.join(self.path, self.index_file + '.tmp')
+        with open(temp_path, 'w') as file:
+            json.dump(index, file)
+        os.replace(temp_path, os.path.join(self.path, self.index_file))
+
+    def save(self, path):
+        """
+        Writes the panel to the folder `path` as a .npy matrix and a JSON index, and returns the saved panel.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, self.values_file), np.asarray(self.values))
+        saved = Panel(self.values, self.dates, self.series, self.freq, path)
+        saved._write_index()
+        return saved
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """
+        Opens a panel written by build or save.
+
+        Parameters:
+        - path (str): The panel's folder.
+        - mmap_mode (str, optional): Passed on to numpy.load. The default 'r' maps the matrix read-only, so only the
+          slices that are used are read from disk. Use None to load it fully into memory.
+        """
+        with open(os.path.join(path, cls.index_file)) as file:
+            index = json.load(file)
+        values = np.load(os.path.join(path, cls.values_file), mmap_mode=mmap_mode)
+        return cls(values, pd.to_datetime(index['dates']), index['series'], index['freq'], path)
+
+    def _rows(self, start=None, end=None):
+        first = self.dates.searchsorted(pd.Timestamp(start)) if start is not None else 0
+        last = self.dates.searchsorted(pd.Timestamp(end), side='right') if end is not None else len(self.dates)
+        return slice(first, last)
+
+    def column(self, series_id, start=None, end=None):
+        """
+        Returns the values of one series between `start` and `end` as a view of the matrix.
+        """
+        return self.values[self._rows(start, end), self.positions[series_id]]
+
+    def columns(self, series_ids, start=None, end=None):
+        """
+        Returns the (dates x len(series_ids)) block for several series between `start` and `end`.
+        """
+        return self.values[self._rows(start, end)][:, [self.positions[series_id] for series_id in series_ids]]
+
+    def to_frame(self, series_ids=None, start=None, end=None):
+        """
+        Returns the panel, or the given series and date range, as a wide pandas DataFrame indexed by date.
+        """
+        rows = self._rows(start, end)
+        if series_ids is None:
+            return pd.DataFrame(np.asarray(self.values[rows]), index=self.dates[rows], columns=self.series)
+        return pd.DataFrame(self.columns(series_ids, start, end), index=self.dates[rows], columns=list(series_ids))
+
+    @property
+    def shape(self):
+        return self.values.shape
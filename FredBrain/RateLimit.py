@@ -1,7 +1,15 @@
+from collections import deque
 from functools import wraps
+import sqlite3
+import threading
 import time
-import requests
 import os
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+requests = LazyModule('requests')
 
 # Assuming you have set these environment variables
 FRED_KEY = os.environ.get("fred_api_key")
@@ -23,38 +31,130 @@ def check_rate_limit(url):
 url = f"{root_url}/series?series_id={series_id}&api_key={FRED_KEY}&file_type=json"
 
 
+class MemoryRateLimitBackend:
+    """
+    Keeps the timestamps of recent calls in process memory. This is the default backend; every RateLimitDecorator
+    using the same instance and bucket shares one budget within the process.
+    """
+    def __init__(self):
+        self.timing = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, bucket, calls, period):
+        """
+        Records a call in `bucket` if fewer than `calls` calls were recorded in the last `period` seconds.
+
+        Returns:
+        - tuple: (wait, count) where wait is 0 if the call was recorded, otherwise the number of seconds until a
+          slot frees up, and count is the number of calls in the current window.
+        """
+        with self.lock:
+            timing = self.timing.setdefault(bucket, deque())
+            now = time.time()
+            while timing and now - timing[0] >= period:
+                timing.popleft()
+            if len(timing) < calls:
+                timing.append(now)
+                return 0, len(timing)
+            return period - (now - timing[0]), len(timing)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Keeps the timestamps of recent calls in a SQLite database, so every process on the host that points at the same
+    file draws from one budget, and the window survives restarts.
+
+    Each reservation runs in an immediate transaction, which takes SQLite's write lock and therefore serializes
+    concurrent reservations across processes. Timestamps are wall-clock times so they stay comparable between
+    processes; a relaunched job sees exactly the calls made in the last period and waits only as long as needed.
+
+    Attributes:
+    - path (str): Location of the SQLite database file. It is created on first use.
+
+    Usage:
+        backend = SQLiteRateLimitBackend("/var/tmp/fred_rate_limit.sqlite")
+        fred = FredBrain(fred_api_key="your_fred_api_key", rate_limit_backend=backend)
+    """
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limit_calls (bucket TEXT NOT NULL, called_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS rate_limit_calls_bucket ON rate_limit_calls (bucket, called_at)")
+            self.local.conn = conn
+        return conn
+
+    def reserve(self, bucket, calls, period):
+        """
+        Records a call in `bucket` if fewer than `calls` calls were recorded in the last `period` seconds by any
+        process. Returns (wait, count) like MemoryRateLimitBackend.reserve.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            conn.execute("DELETE FROM rate_limit_calls WHERE bucket = ? AND called_at <= ?", (bucket, now - period))
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(called_at) FROM rate_limit_calls WHERE bucket = ?", (bucket,)).fetchone()
+            if count < calls:
+                conn.execute("INSERT INTO rate_limit_calls (bucket, called_at) VALUES (?, ?)", (bucket, now))
+                result = (0, count + 1)
+            else:
+                result = (period - (now - oldest), count)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
 class RateLimitDecorator:
     """
     A decorator to enforce rate limiting for any function, especially useful for API calls.
 
+    Calls are counted over a sliding window of `period` seconds. A call that would exceed the limit waits until the
+    oldest call in the window has expired instead of being skipped. Where the window is kept is up to the backend:
+    MemoryRateLimitBackend (the default) shares it within one process, SQLiteRateLimitBackend across processes.
+    Any object with a reserve(bucket, calls, period) method returning (wait, count) can be used as a backend.
+
     Attributes:
     - calls (int): The number of calls allowed within the specified period.
     - period (int): The period (in seconds) for which the rate limit applies.
+    - backend (object, optional): Where call timestamps are kept. Defaults to a new MemoryRateLimitBackend.
+    - bucket (str, optional): The budget to draw from within the backend, e.g. one per API key.
     """
-    def __init__(self, calls, period=60):  # per-minute management
+    def __init__(self, calls, period=60, backend=None, bucket='default'):  # per-minute management
         self.calls = calls
         self.period = period
-        self.timing = []
+        self.backend = backend if backend is not None else MemoryRateLimitBackend()
+        self.bucket = bucket
         self.total_calls = 0
-        self.reset_time = None
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a call is allowed under the rate limit and records it.
+        """
+        with self.lock:
+            self.total_calls += 1
+            total_calls = self.total_calls
+        while True:
+            wait, count = self.backend.reserve(self.bucket, self.calls, self.period)
+            if wait <= 0:
+                break
+            print(f"Rate limit exceeded. Sleeping for {wait:.1f} seconds before putting worker back to work.")
+            time.sleep(wait)
+        print(f"Current call count: {count}, Total calls: {total_calls}\n")
 
     def __call__(self, func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            self.total_calls += 1
-            now = time.time()
-            # If we have hit the limit and are within the reset period, sleep until the reset period is over
-            if self.reset_time and now < self.reset_time:
-                print(f"Rate limit exceeded. Sleeping for 60 seconds before putting worker back to work .")
-                time.sleep(60)
-                self.reset_time = None  # Reset the reset_time
-            if len(self.timing) > self.calls:
-                self.reset_time = now + self.period
-                self.timing.clear()  # Clear the timing list to start fresh after waiting
-            else:
-                print(f"Current call count: {len(self.timing)}, Total calls: {self.total_calls}\n")
-                result = func(*args, **kwargs)
-                self.timing.append(now)
-                return result
+            self.acquire()
+            return func(*args, **kwargs)
 
         return wrapper
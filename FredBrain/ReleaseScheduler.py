@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+try:
+    from .SyncState import SyncState
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from SyncState import SyncState
+
+
+class ReleaseScheduler:
+    """
+    Refreshes tracked series right after FRED publishes their release, and stays idle in between.
+
+    Every tracked series is mapped to its release once (series/release), and the mapping is cached in a JSON file.
+    The release calendar for the coming `calendar_days` comes from releases/dates and is re-read daily. FRED's
+    calendar gives dates but no times, so on each release date the scheduler checks at the `check_times` (US
+    Eastern, the times at which most releases are published). Each check runs FredBrain.sync_series for the series
+    of the releases due that day. sync_series compares 'last_updated' stamps first, so a check that comes before
+    the data is out costs a few metadata calls and no observation downloads. A release counts as done for the day
+    once all its series carry a 'last_updated' stamp from that date, and it is not checked again.
+
+    With a `schedule_path`, the time of the last check and the releases done are kept in a JSON file, so a new
+    process, such as one started by cron, carries on where the previous one stopped instead of repeating the
+    day's checks.
+
+    Attributes:
+    - check_times (tuple): Times of day, in `timezone`, at which due releases are checked.
+    - timezone (str): The time zone of `check_times` and of the release calendar.
+    - calendar_days (int): How far ahead the release calendar is read.
+    - error_backoff (float): Seconds run waits after a failed check; doubled after every further failure, up to
+      `max_idle`.
+
+    Usage:
+        fred = FredBrain(fred_api_key="your_fred_api_key")
+        scheduler = ReleaseScheduler(fred, series_list, "state/latest_releases.json",
+                                     sink=lambda series_id, df: db_manager.insert_new_rows(df, 'LatestRelease'),
+                                     mapping_path="state/series_releases.json",
+                                     schedule_path="state/release_schedule.json")
+        scheduler.run()  # blocks; or call scheduler.run_pending() from cron
+    """
+    check_times = ('08:35', '09:20', '10:05', '14:05', '16:35', '21:00')
+    timezone = 'America/New_York'
+    calendar_days = 14
+    error_backoff = 60
+
+    def __init__(self, fred, series_ids, state_path, release='latest', sink=None, mapping_path=None,
+                 schedule_path=None):
+        self.fred = fred
+        self.series_ids = list(dict.fromkeys(str(series_id) for series_id in series_ids))
+        self.state_path = state_path
+        self.release = release
+        self.sink = sink
+        self.mapping_path = mapping_path
+        self.schedule_path = schedule_path
+        self.zone = ZoneInfo(self.timezone)
+        self.releases = {}
+        self.calendar = {}
+        self.calendar_read = None
+        self.done = set()
+        self.last_check = None
+        self.stop_event = threading.Event()
+        self.load_schedule()
+
+    def load_schedule(self):
+        """
+        Reads the last check time and the releases done from `schedule_path`, if there is one.
+        """
+        if not self.schedule_path or not os.path.exists(self.schedule_path):
+            return
+        with open(self.schedule_path, 'r', encoding='utf-8') as schedule_file:
+            schedule = json.load(schedule_file)
+        if schedule.get('last_check'):
+            self.last_check = datetime.fromisoformat(schedule['last_check'])
+        self.done = {(int(release_id), date.fromisoformat(release_date))
+                     for release_id, release_date in schedule.get('done', [])}
+
+    def save_schedule(self, now):
+        """
+        Writes the last check time and the releases done to `schedule_path`, dropping releases dated before today.
+        """
+        if not self.schedule_path:
+            return
+        self.done = {(release_id, release_date) for release_id, release_date in self.done
+                     if release_date >= now.date()}
+        folder = os.path.dirname(self.schedule_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_path = self.schedule_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as schedule_file:
+            json.dump({'last_check': self.last_check.isoformat() if self.last_check else None,
+                       'done': sorted([release_id, release_date.isoformat()]
+                                      for release_id, release_date in self.done)},
+                      schedule_file, indent=2)
+        os.replace(temp_path, self.schedule_path)
+
+    def series_releases(self):
+        """
+        Returns {release_id: [series ids]} for the tracked series, looking up only series that are not in the mapping
+        file yet.
+        """
+        mapping = {}
+        if self.mapping_path and os.path.exists(self.mapping_path):
+            with open(self.mapping_path, 'r', encoding='utf-8') as mapping_file:
+                mapping = json.load(mapping_file)
+        missing = [series_id for series_id in self.series_ids if series_id not in mapping]
+        if missing:
+            print(f"Looking up the release of {len(missing)} series.")
+            found = self.fred.fetch_series_releases(missing)
+            mapping.update(zip(found['series_id'], found['release_id'].astype(int)))
+            if self.mapping_path:
+                folder = os.path.dirname(self.mapping_path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                temp_path = self.mapping_path + '.tmp'
+                with open(temp_path, 'w', encoding='utf-8') as mapping_file:
+                    json.dump(mapping, mapping_file, indent=2, sort_keys=True)
+                os.replace(temp_path, self.mapping_path)
+        releases = {}
+        for series_id in self.series_ids:
+            if series_id in mapping:
+                releases.setdefault(int(mapping[series_id]), []).append(series_id)
+            else:
+                print(f"No release found for series {series_id}; it is not scheduled.")
+        self.releases = releases
+        return releases
+
+    def refresh_calendar(self, now=None):
+        """
+        Reads the release dates of the tracked releases from today until `calendar_days` ahead.
+        """
+        now = now or datetime.now(self.zone)
+        if not self.releases:
+            self.series_releases()
+        calendar = self.fred.fetch_release_dates(now.date(), now.date() + timedelta(days=self.calendar_days))
+        if calendar is None:
+            print("Keeping the previous release calendar.")
+            return self.calendar
+        tracked = calendar[calendar['release_id'].isin(list(self.releases))]
+        self.calendar = {}
+        for release_id, release_date in zip(tracked['release_id'], tracked['date'].dt.date):
+            self.calendar.setdefault(release_date, set()).add(int(release_id))
+        self.calendar_read = now
+        print(f"{len(tracked)} scheduled releases of tracked series in the next {self.calendar_days} days.")
+        return self.calendar
+
+    def _checks(self, release_date):
+        return [datetime.combine(release_date, time.fromisoformat(check), tzinfo=self.zone)
+                for check in self.check_times]
+
+    def due_releases(self, now):
+        """
+        Returns the release ids with a check time that passed since the last check and that are not done yet.
+        """
+        due = set()
+        for release_date, release_ids in self.calendar.items():
+            if any((self.last_check is None or check > self.last_check) and check <= now
+                   for check in self._checks(release_date)):
+                due.update(release_id for release_id in release_ids if (release_id, release_date) not in self.done)
+        return due
+
+    def next_check(self, now):
+        """
+        Returns the time of the next check of a release that is not done, or None if there is none in the calendar.
+        """
+        upcoming = [check for release_date, release_ids in self.calendar.items()
+                    if any((release_id, release_date) not in self.done for release_id in release_ids)
+                    for check in self._checks(release_date) if check > now]
+        return min(upcoming) if upcoming else None
+
+    def run_pending(self, now=None):
+        """
+        Refreshes the series of every release that is due now. Safe to call as often as wanted; to call it from
+        cron, give the scheduler a `schedule_path` so checks already run are remembered between processes.
+
+        Returns:
+        - pandas.DataFrame or None: What sync_series returned for the refreshed series, or None if nothing was due.
+        """
+        now = now or datetime.now(self.zone)
+        if self.calendar_read is None or now - self.calendar_read >= timedelta(days=1):
+            self.refresh_calendar(now)
+        due = self.due_releases(now)
+        self.last_check = now
+        if not due:
+            self.save_schedule(now)
+            return None
+        series_ids = [series_id for release_id in sorted(due) for series_id in self.releases.get(release_id, [])]
+        print(f"Checking {len(due)} due releases covering {len(series_ids)} series.")
+        result = self.fred.sync_series(series_ids, self.state_path, release=self.release, sink=self.sink)
+        stamps = SyncState(self.state_path).last_updated
+        for release_date, release_ids in self.calendar.items():
+            for release_id in release_ids & due:
+                if all(str(stamps.get(series_id, ''))[:10] >= release_date.isoformat()
+                       for series_id in self.releases.get(release_id, [])):
+                    self.done.add((release_id, release_date))
+        self.save_schedule(now)
+        return result
+
+    def run(self, max_idle=timedelta(hours=6)):
+        """
+        Runs due checks until stop is called, sleeping until the next check in between. The sleep is capped at
+        `max_idle` so a changed release calendar is noticed. A check that fails is logged and followed by a wait of
+        `error_backoff` seconds, doubled after every further failure, before the scheduler tries again.
+        """
+        failures = 0
+        while not self.stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                failures += 1
+                delay = min(self.error_backoff * 2 ** (failures - 1), max_idle.total_seconds())
+                print(f"Release check failed ({e}), trying again in {delay:.0f} seconds.")
+                self.stop_event.wait(delay)
+                continue
+            failures = 0
+            now = datetime.now(self.zone)
+            wake = self.next_check(now)
+            wake = min(wake, now + max_idle) if wake is not None else now + max_idle
+            print(f"Next release check at {wake:%Y-%m-%d %H:%M %Z}.")
+            self.stop_event.wait((wake - now).total_seconds())
+
+    def stop(self):
+        self.stop_event.set()
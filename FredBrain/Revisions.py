@@ -0,0 +1,206 @@
+# Vectorized helpers for working with the all-releases (vintage) frames returned by FredBrain
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+
+def _same_values(left, right, tolerance=None):
+    """
+    Element-wise equality of two float arrays where NaN equals NaN. With a `tolerance`, values are compared
+    relative to their magnitude, which is needed for values read back from single-precision FLOAT columns.
+    """
+    both_missing = np.isnan(left) & np.isnan(right)
+    if tolerance is None:
+        return (left == right) | both_missing
+    return np.isclose(left, right, rtol=tolerance, atol=0.0) | both_missing
+
+
+def compact_releases(df, tolerance=None):
+    """
+    Compacts an all-releases frame so that it only keeps the vintages in which a reporting date's value changed.
+
+    FRED republishes the full history of a series with every release, so most vintage rows repeat the value of the
+    previous vintage. Consecutive vintages of the same series and reporting date that carry the same value and whose
+    validity intervals touch are merged into one row. The merged row keeps the first vintage's 'Published Date' and
+    'Unique Key' and takes the 'Validity Date' of the last vintage in the run, so the value known at any as-of date
+    can still be read from the compacted frame.
+
+    Parameters:
+    - df (pandas.DataFrame): A frame in the shape returned by retrieve_series_all_releases, with at least 'Series',
+      'Reporting Date', 'Published Date', 'Validity Date' and 'Value' columns.
+    - tolerance (float, optional): Relative tolerance for treating two values as equal. Defaults to exact equality.
+
+    Returns:
+    - pandas.DataFrame: The compacted frame, sorted by 'Series', 'Reporting Date' and 'Published Date'.
+
+    Usage:
+        all_releases = fred.retrieve_series_all_releases(["GDP", "UNRATE"])
+        compacted = compact_releases(all_releases)
+    """
+    if df.empty:
+        return df
+    ordered = df.sort_values(['Series', 'Reporting Date', 'Published Date'], kind='mergesort').reset_index(drop=True)
+    series = ordered['Series'].to_numpy()
+    reporting = ordered['Reporting Date'].to_numpy()
+    published = ordered['Published Date'].to_numpy()
+    validity = ordered['Validity Date'].to_numpy()
+    values = ordered['Value'].to_numpy(dtype=float)
+    starts_run = np.ones(len(ordered), dtype=bool)
+    same_date = (series[1:] == series[:-1]) & (reporting[1:] == reporting[:-1])
+    same_value = _same_values(values[1:], values[:-1], tolerance)
+    # A vintage only continues the previous one if it starts no later than the day after the previous one ended
+    touching = published[1:] <= validity[:-1] + np.timedelta64(1, 'D')
+    starts_run[1:] = ~(same_date & same_value & touching)
+    first = np.flatnonzero(starts_run)
+    compacted = ordered.iloc[first].reset_index(drop=True)
+    compacted['Validity Date'] = np.maximum.reduceat(validity, first)
+    return compacted
+
+
+def _vintage_groups(df):
+    """
+    Sorts an all-releases frame by series, reporting date and publication date and returns the sorted frame along
+    with the start offset of every (Series, Reporting Date) group and each row's position within its group.
+    """
+    ordered = df.sort_values(['Series', 'Reporting Date', 'Published Date'], kind='mergesort').reset_index(drop=True)
+    series = ordered['Series'].to_numpy()
+    reporting = ordered['Reporting Date'].to_numpy()
+    starts_group = np.ones(len(ordered), dtype=bool)
+    starts_group[1:] = (series[1:] != series[:-1]) | (reporting[1:] != reporting[:-1])
+    starts = np.flatnonzero(starts_group)
+    sizes = np.diff(np.append(starts, len(ordered)))
+    position = np.arange(len(ordered)) - np.repeat(starts, sizes)
+    return ordered, starts, sizes, position
+
+
+def nth_release(df, n=0):
+    """
+    Returns the n-th published vintage of every series and reporting date in an all-releases frame.
+
+    Parameters:
+    - df (pandas.DataFrame): A frame in the shape returned by retrieve_series_all_releases, for any number of series.
+    - n (int, optional): 0 for the first release (default), 1 for the first revision and so on. Negative values count
+      from the latest vintage, so -1 returns the latest release. Reporting dates with fewer vintages are left out.
+
+    Returns:
+    - pandas.DataFrame: One row per series and reporting date, with the columns of `df`.
+
+    Usage:
+        first_revisions = nth_release(all_releases, 1)
+    """
+    if df.empty:
+        return df
+    ordered, starts, sizes, position = _vintage_groups(df)
+    if n >= 0:
+        selected = position == n
+    else:
+        selected = position == np.repeat(sizes, sizes) + n
+    return ordered[selected].reset_index(drop=True)
+
+
+def release_as_of_lag(df, days):
+    """
+    Returns, for every series and reporting date, the vintage that was current `days` days after the reporting date,
+    i.e. the latest vintage published on or before 'Reporting Date' + `days`. Useful for building real-time datasets
+    with a fixed information lag.
+
+    Parameters:
+    - df (pandas.DataFrame): A frame in the shape returned by retrieve_series_all_releases.
+    - days (int): The number of days after the reporting date at which the value is read.
+
+    Returns:
+    - pandas.DataFrame: One row per series and reporting date that had been published by then, with the columns of
+      `df`.
+
+    Usage:
+        known_after_90_days = release_as_of_lag(all_releases, 90)
+    """
+    if df.empty:
+        return df
+    ordered, starts, sizes, position = _vintage_groups(df)
+    group = np.repeat(np.arange(len(starts)), sizes)
+    cutoff = ordered['Reporting Date'].to_numpy() + np.timedelta64(int(days), 'D')
+    known = np.flatnonzero(ordered['Published Date'].to_numpy() <= cutoff)
+    if len(known) == 0:
+        # Nothing had been published within the lag
+        return ordered.iloc[:0]
+    # Rows are sorted by publication date within a group, so the last known row of each group is the one in effect
+    known_group = group[known]
+    is_last = np.ones(len(known), dtype=bool)
+    is_last[:-1] = known_group[1:] != known_group[:-1]
+    return ordered.iloc[known[is_last]].reset_index(drop=True)
+
+
+def revision_summary(df):
+    """
+    Summarizes the revision history of every series and reporting date in an all-releases frame in one grouped
+    pass over sorted arrays.
+
+    Parameters:
+    - df (pandas.DataFrame): A frame in the shape returned by retrieve_series_all_releases.
+
+    Returns:
+    - pandas.DataFrame: One row per series and reporting date with the columns 'Series', 'Reporting Date',
+      'First Published', 'Latest Published', 'First Value', 'Latest Value', 'Revision' (latest minus first value),
+      'Revision Count' (number of vintages whose value differed from the previous vintage) and 'Vintages'.
+
+    Usage:
+        summary = revision_summary(all_releases)
+        summary.sort_values('Revision', key=abs, ascending=False).head()
+    """
+    columns = ['Series', 'Reporting Date', 'First Published', 'Latest Published', 'First Value', 'Latest Value',
+               'Revision', 'Revision Count', 'Vintages']
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    ordered, starts, sizes, position = _vintage_groups(df)
+    last = starts + sizes - 1
+    values = ordered['Value'].to_numpy(dtype=float)
+    published = ordered['Published Date'].to_numpy()
+    changed = np.zeros(len(ordered), dtype=np.int64)
+    changed[1:] = ~_same_values(values[1:], values[:-1])
+    changed[starts] = 0
+    summary = pd.DataFrame({
+        'Series': ordered['Series'].to_numpy()[starts],
+        'Reporting Date': ordered['Reporting Date'].to_numpy()[starts],
+        'First Published': published[starts],
+        'Latest Published': published[last],
+        'First Value': values[starts],
+        'Latest Value': values[last],
+    })
+    summary['Revision'] = summary['Latest Value'] - summary['First Value']
+    summary['Revision Count'] = np.add.reduceat(changed, starts)
+    summary['Vintages'] = sizes
+    return summary
+
+
+def series_revision_statistics(df):
+    """
+    Aggregates revision_summary to one row per series.
+
+    Parameters:
+    - df (pandas.DataFrame): A frame in the shape returned by retrieve_series_all_releases, or the output of
+      revision_summary.
+
+    Returns:
+    - pandas.DataFrame: One row per series with 'Observations', 'Revised Observations' (reporting dates revised at
+      least once), 'Revision Count', 'Mean Revision' and 'Mean Absolute Revision' (first to latest value).
+
+    Usage:
+        statistics = series_revision_statistics(all_releases)
+    """
+    summary = df if 'Revision Count' in df else revision_summary(df)
+    grouped = summary.assign(**{
+        'Revised': summary['Revision Count'] > 0,
+        'Absolute Revision': summary['Revision'].abs(),
+    }).groupby('Series', sort=True)
+    return pd.DataFrame({
+        'Observations': grouped.size(),
+        'Revised Observations': grouped['Revised'].sum(),
+        'Revision Count': grouped['Revision Count'].sum(),
+        'Mean Revision': grouped['Revision'].mean(),
+        'Mean Absolute Revision': grouped['Absolute Revision'].mean(),
+    }).reset_index()
@@ -0,0 +1,246 @@
+import os
+import sqlite3
+from sqlite3 import Error
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+pd = LazyModule('pandas')
+
+
+class SQLiteBrain:
+    """
+    An embedded alternative to MySQLBrain for single-node deployments and local work. It offers the same table
+    methods (fred_create_table_sql, fred_insert_into_table, insert_new_rows, read_table) on a SQLite database file,
+    so no server, credentials or SSL setup are needed.
+
+    The database runs in WAL mode, so readers are not blocked while a load is running. Every load is one
+    transaction however many batches it has, which is what makes SQLite ingestion fast. Tables with a 'Unique Key'
+    column get a unique index on it: insert_new_rows then lets SQLite skip rows that are already stored with
+    INSERT OR IGNORE, instead of going through a temporary table.
+
+    Dates are stored as ISO-8601 text in columns declared DATETIME and are parsed back by read_table.
+
+    Attributes:
+    - path (str): The database file. It is created if it does not exist; ':memory:' gives a throwaway database.
+
+    Usage:
+        db_manager = SQLiteBrain("fred.sqlite")
+        db_manager.fred_create_table_sql(fred.retrieve_series_latest_release(series_list), 'LatestRelease')
+        db_manager.insert_new_rows(fred.retrieve_series_latest_release(series_list), 'LatestRelease')
+        unrate = db_manager.read_table('LatestRelease', series_ids=['UNRATE'])
+    """
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self.cursor = None
+        self.connect()
+
+    def connect(self):
+        """
+        Opens the database file, switches it to WAL mode and initializes a cursor.
+        """
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL only syncs at checkpoints; a power loss can lose the last commits but not corrupt
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.cursor = self.conn.cursor()
+            print("SQLite database connection successful.")
+        except Error as e:
+            print(f"Database connection failed: {e}")
+
+    def list_tables(self):
+        """
+        Lists all tables in the database.
+        """
+        try:
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")
+            print("List of tables:")
+            for (table,) in self.cursor.fetchall():
+                print(table)
+        except Error as e:
+            print(f"Failed to list tables: {e}")
+
+    def check_table_exists(self, table_name):
+        """
+        Returns True if `table_name` exists in the database, False otherwise.
+        """
+        try:
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+            if self.cursor.fetchone() is not None:
+                print(f"Table already exists: {table_name}")
+                return True
+            else:
+                print(f"Table does not exist: {table_name}")
+                return False
+        except Error as e:
+            print(f"Failed to check table existence: {e}")
+            return False
+
+    @staticmethod
+    def _rows(df):
+        """
+        Converts a DataFrame to a list of tuples SQLite can bind: dates become ISO text and missing values None.
+        """
+        columns = []
+        for column in df.columns:
+            values = df[column]
+            if pd.api.types.is_datetime64_any_dtype(values):
+                values = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+            columns.append(values.astype(object).where(values.notna(), None).tolist())
+        return list(zip(*columns))
+
+    def _insert(self, statement, df, table_name, chunk_size):
+        """
+        Runs `statement` for every row of `df` in batches of `chunk_size`, all within one transaction. Returns the
+        number of rows written, or None if the load failed and was rolled back.
+        """
+        rows = self._rows(df)
+        written = 0
+        in_transaction = False
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE")
+            in_transaction = True
+            for i in range(0, len(rows), chunk_size):
+                before = self.conn.total_changes
+                self.cursor.executemany(statement, rows[i:i + chunk_size])
+                written += self.conn.total_changes - before
+            self.cursor.execute("COMMIT")
+            return written
+        except Error as e:
+            print(f"Failed to insert data into table '{table_name}': {e}")
+            # Only roll back a transaction this call opened; if BEGIN itself failed there is nothing to undo
+            if in_transaction and self.conn.in_transaction:
+                try:
+                    self.cursor.execute("ROLLBACK")
+                except Error:
+                    # A failed rollback must not replace the error that caused it
+                    raise e
+            return None
+
+    def fred_insert_into_table(self, table_name, df, chunk_size=10000):
+        """
+        Inserts every row of a DataFrame into `table_name` in one transaction.
+
+        Parameters:
+        - table_name (str): The name of the table into which the data will be inserted.
+        - df (pandas.DataFrame): The DataFrame containing the data to insert.
+        - chunk_size (int, optional): Rows per executemany batch.
+
+        Usage Example:
+        db_manager.fred_insert_into_table('example_table', dataframe)
+        """
+        column_names = ', '.join([f'"{column}"' for column in df.columns])
+        placeholders = ', '.join(['?' for _ in df.columns])
+        sql_insert_statement = f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
+        print(f"SQL Statement - Insert Rows:\n {sql_insert_statement}")
+        total_rows_inserted = self._insert(sql_insert_statement, df, table_name, chunk_size)
+        if total_rows_inserted is not None:
+            print(f"All data inserted successfully into '{table_name}'. Total rows inserted: {total_rows_inserted}.")
+
+    def fred_create_table_sql(self, df, table_name):
+        """
+        Creates a table matching the structure of a DataFrame, with a unique index on 'Unique Key' if the frame has
+        one, and inserts the DataFrame's rows into it. Nothing is done if the table already exists.
+
+        Parameters:
+        - df (pandas.DataFrame): The DataFrame based on which the table structure is determined.
+        - table_name (str): The name of the table to create.
+
+        Usage Example:
+        db_manager.fred_create_table_sql(dataframe, 'example_table')
+        """
+        columns_with_types = ['"sql_upload_datetime" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP']
+        for index, value in df.dtypes.items():
+            if str(value).startswith('int') or str(value).startswith('bool'):
+                sqldtype = 'INTEGER'
+            elif str(value).startswith('float'):
+                sqldtype = 'REAL'
+            elif str(value).startswith('datetime') or str(value).startswith('date'):
+                sqldtype = 'DATETIME'
+            else:
+                sqldtype = 'TEXT'
+            columns_with_types.append(f'"{index}" {sqldtype}')
+        columns_type_sql = ', '.join(columns_with_types)
+        if self.check_table_exists(table_name) is False:
+            print(f'SQL Statement - Create Table:\nCREATE TABLE IF NOT EXISTS "{table_name}" ({columns_type_sql})')
+            self.cursor.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}" ({columns_type_sql})')
+            if 'Unique Key' in df.columns:
+                self.cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table_name}_unique_key" '
+                                    f'ON "{table_name}" ("Unique Key")')
+            if 'Series' in df.columns:
+                self.cursor.execute(f'CREATE INDEX IF NOT EXISTS "{table_name}_series" ON "{table_name}" ("Series")')
+            print(f"Table '{table_name}' created successfully.")
+            self.fred_insert_into_table(table_name, df)
+        else:
+            print(f"Table '{table_name}' already exists.")
+
+    def insert_new_rows(self, df, table_name, chunk_size=10000):
+        """
+        Inserts the rows of a DataFrame whose 'Unique Key' is not stored in `table_name` yet.
+
+        The unique index created by fred_create_table_sql lets SQLite skip already stored keys with INSERT OR
+        IGNORE, so the whole incremental load is a single pass in one transaction.
+
+        Parameters:
+        - df (pandas.DataFrame): A DataFrame containing the new rows to insert, with a 'Unique Key' column.
+        - table_name (str): The name of the table into which the new rows will be inserted.
+        - chunk_size (int, optional): Rows per executemany batch.
+
+        Usage Example:
+        - db_manager.insert_new_rows(new_rows_dataframe, 'example_table')
+        """
+        column_names = ', '.join([f'"{column}"' for column in df.columns])
+        placeholders = ', '.join(['?' for _ in df.columns])
+        insert_stmt = f'INSERT OR IGNORE INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
+        rows_inserted = self._insert(insert_stmt, df, table_name, chunk_size)
+        if rows_inserted is not None:
+            print(f"{rows_inserted} rows inserted successfully into '{table_name}'.")
+
+    def read_table(self, table_name, series_ids=None, columns=None):
+        """
+        Reads a table back into a DataFrame, with DATETIME columns parsed into datetime64.
+
+        Parameters:
+        - table_name (str): The table to read.
+        - series_ids (list, optional): Only read the rows of these series.
+        - columns (list, optional): Only read these columns. Defaults to every column.
+
+        Returns:
+        - pandas.DataFrame: The rows, or an empty DataFrame if the query failed.
+
+        Usage Example:
+        unrate = db_manager.read_table('LatestRelease', series_ids=['UNRATE'])
+        """
+        try:
+            declared = {name: column_type for _, name, column_type, *_ in
+                        self.cursor.execute(f'PRAGMA table_info("{table_name}")').fetchall()}
+            selected = ', '.join([f'"{column}"' for column in columns]) if columns else '*'
+            query = f'SELECT {selected} FROM "{table_name}"'
+            params = []
+            if series_ids:
+                query += f' WHERE "Series" IN ({", ".join(["?" for _ in series_ids])})'
+                params = list(series_ids)
+            self.cursor.execute(query, params)
+            df = pd.DataFrame(self.cursor.fetchall(), columns=[column[0] for column in self.cursor.description])
+        except Error as e:
+            print(f"Failed to read table '{table_name}': {e}")
+            return pd.DataFrame()
+        for column in df.columns:
+            if declared.get(column, '').upper() in ('DATETIME', 'DATE', 'TIMESTAMP'):
+                df[column] = pd.to_datetime(df[column])
+        return df
+
+    def close_connection(self):
+        """
+        Closes the connection to the database.
+        """
+        if self.conn is not None:
+            self.cursor.close()
+            self.conn.close()
+            print("SQLite connection is closed.")
@@ -0,0 +1,92 @@
+import itertools
+import threading
+import time
+
+
+class _Ticket:
+    def __init__(self, priority, rank, deadline, sequence):
+        self.priority = priority
+        self.rank = rank
+        self.deadline = deadline
+        self.sequence = sequence
+        self.enqueued = time.time()
+
+
+class RequestScheduler:
+    """
+    Hands out a shared rate budget to waiting requests by priority class instead of arrival order.
+
+    Every request that is about to draw from the rate limiter first takes a ticket. Tickets are served one at a
+    time: the ticket being served waits for its rate limit slot, and the next ticket is only chosen once that slot
+    is granted, so a request that arrives while a large backfill is queued overtakes every backfill request that
+    has not been served yet. Within a class, earlier deadlines go first and ties keep arrival order.
+
+    Lower classes cannot starve: a ticket's rank improves by one class for every `aging` seconds it has waited,
+    and a ticket whose deadline is less than `urgency` seconds away is served ahead of all classes.
+
+    Attributes:
+    - priorities (dict): The priority classes and their rank, lower being served first.
+    - aging (float): Seconds of waiting that promote a ticket by one class.
+    - urgency (float): Seconds before its deadline at which a ticket jumps ahead of every class.
+
+    Usage:
+        scheduler = RequestScheduler()
+        scheduler.acquire(rate_limiter, priority='interactive', deadline=time.time() + 5)
+    """
+    priorities = {'interactive': 0, 'normal': 1, 'backfill': 2}
+
+    def __init__(self, aging=30.0, urgency=2.0):
+        self.aging = aging
+        self.urgency = urgency
+        self.condition = threading.Condition()
+        self.waiting = []
+        self.serving = False
+        self.sequence = itertools.count()
+        self.dispatched = {priority: 0 for priority in self.priorities}
+
+    def _order(self, ticket, now):
+        rank = ticket.rank - (now - ticket.enqueued) / self.aging
+        if ticket.deadline is not None and ticket.deadline - now < self.urgency:
+            rank = -1
+        deadline = ticket.deadline if ticket.deadline is not None else float('inf')
+        return rank, deadline, ticket.sequence
+
+    def _next(self):
+        now = time.time()
+        return min(self.waiting, key=lambda ticket: self._order(ticket, now))
+
+    def acquire(self, rate_limiter, priority='normal', deadline=None):
+        """
+        Waits for this request's turn and then for a slot from `rate_limiter`.
+
+        Parameters:
+        - rate_limiter (RateLimitDecorator): The limiter whose budget is being shared.
+        - priority (str, optional): One of the keys of `priorities`. Defaults to 'normal'.
+        - deadline (float, optional): A time.time() timestamp by which the request should be sent.
+        """
+        if priority not in self.priorities:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of {list(self.priorities)}.")
+        ticket = _Ticket(priority, self.priorities[priority], deadline, next(self.sequence))
+        with self.condition:
+            self.waiting.append(ticket)
+            while self.serving or self._next() is not ticket:
+                self.condition.wait()
+            self.waiting.remove(ticket)
+            self.serving = True
+        try:
+            rate_limiter.acquire()
+        finally:
+            with self.condition:
+                self.serving = False
+                self.dispatched[priority] += 1
+                self.condition.notify_all()
+
+    def queue_depth(self):
+        """
+        Returns the number of requests currently waiting in each priority class.
+        """
+        with self.condition:
+            depth = {priority: 0 for priority in self.priorities}
+            for ticket in self.waiting:
+                depth[ticket.priority] += 1
+            return depth
@@ -0,0 +1,113 @@
+import math
+import re
+import threading
+from collections import Counter
+
+
+class SearchIndex:
+    """
+    A local full-text index over FRED series metadata, ranked with BM25.
+
+    Each series record is indexed by its 'title', 'tags', 'units', 'frequency' and 'notes' fields. Terms count more
+    in some fields than in others (see `field_weights`), so a word in the title outranks the same word in the notes.
+    FredBrain subscribes the index to its SeriesRegistry, so every series seen in a search, category, series, tags
+    or updates response becomes searchable offline. A query is answered from memory in milliseconds and costs no
+    rate budget.
+
+    Attributes:
+    - field_weights (dict): How much one occurrence of a term in each field counts.
+    - k1 (float), b (float): The BM25 term-frequency saturation and length normalization parameters.
+
+    Usage:
+        index = SearchIndex()
+        index.add_records(response_json['seriess'])
+        index.search("core inflation", limit=10)
+    """
+    field_weights = {'title': 3.0, 'tags': 2.0, 'units': 1.0, 'frequency': 1.0, 'notes': 0.5}
+    k1 = 1.2
+    b = 0.75
+    stop_words = frozenset(['a', 'an', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'by', 'with'])
+
+    def __init__(self):
+        self.postings = {}
+        self.documents = {}
+        self.lengths = {}
+        self.total_length = 0.0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def tokenize(cls, text):
+        return [term for term in re.findall(r'[a-z0-9]+', str(text).lower()) if term not in cls.stop_words]
+
+    def _field_text(self, record, field):
+        value = record.get(field)
+        if value is None:
+            return ''
+        if isinstance(value, (list, tuple, set)):
+            return ' '.join(str(item) for item in value)
+        return str(value)
+
+    def add_records(self, records):
+        """
+        Indexes series records, replacing the indexed version of series that are already in the index.
+        """
+        with self.lock:
+            for record in records:
+                series_id = record.get('id')
+                if series_id is None:
+                    continue
+                self._remove(series_id)
+                weights = Counter()
+                for field, weight in self.field_weights.items():
+                    for term in self.tokenize(self._field_text(record, field)):
+                        weights[term] += weight
+                # The series id itself is always a perfect title match
+                weights[str(series_id).lower()] += self.field_weights['title']
+                for term, weight in weights.items():
+                    self.postings.setdefault(term, {})[series_id] = weight
+                self.documents[series_id] = list(weights)
+                self.lengths[series_id] = sum(weights.values())
+                self.total_length += self.lengths[series_id]
+
+    def _remove(self, series_id):
+        for term in self.documents.pop(series_id, []):
+            postings = self.postings[term]
+            del postings[series_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(series_id, 0.0)
+
+    def search(self, text, limit=None):
+        """
+        Ranks the indexed series against `text`.
+
+        Parameters:
+        - text (str): The query. Series matching any of its terms are returned; matching more terms, rarer terms
+          and terms in heavier fields ranks higher.
+        - limit (int, optional): The number of results. Defaults to all matches.
+
+        Returns:
+        - list: (series_id, score) tuples, best match first.
+        """
+        terms = set(self.tokenize(text))
+        with self.lock:
+            count = len(self.documents)
+            if count == 0:
+                return []
+            average_length = self.total_length / count
+            scores = Counter()
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for series_id, weight in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.lengths[series_id] / average_length)
+                    scores[series_id] += idf * weight * (self.k1 + 1) / (weight + norm)
+        return scores.most_common(limit)
+
+    def __contains__(self, series_id):
+        return series_id in self.documents
+
+    def __len__(self):
+        return len(self.documents)
@@ -0,0 +1,71 @@
+import threading
+
+
+class SeriesRegistry:
+    """
+    An in-memory registry of FRED series metadata records, keyed by series ID.
+
+    Search, category, series and series/updates responses all carry complete series records ('id', 'title',
+    'frequency', 'units', 'popularity', 'notes', 'last_updated', ...). FredBrain adds every record it receives to the
+    registry so that later metadata lookups for the same series can be answered without another API call.
+
+    Usage:
+        registry = SeriesRegistry()
+        registry.add_records(response_json['seriess'])
+        registry.get('UNRATE')['title']
+    """
+    # Fields every full series record from FRED carries; a record without one of them was only partially seen
+    core_fields = ('id', 'title', 'frequency', 'units', 'last_updated')
+
+    def __init__(self):
+        self.records = {}
+        self.lock = threading.Lock()
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """
+        Registers `listener` to be called with the list of merged records after every add_records call, e.g. to keep
+        a SearchIndex in step with the registry.
+        """
+        self.listeners.append(listener)
+
+    def add_records(self, records, existing_only=False):
+        """
+        Adds or refreshes series records. Fields of an existing record are updated with the new values, so a
+        record seen first in a search and later through the series endpoint keeps the union of both. With
+        `existing_only`, records of series that are not in the registry yet are ignored, which keeps partial
+        records such as tag lists from standing in for full ones.
+        """
+        merged = []
+        with self.lock:
+            for record in records:
+                series_id = record.get('id')
+                if series_id is None:
+                    continue
+                existing = self.records.get(series_id)
+                if existing is None:
+                    if existing_only:
+                        continue
+                    existing = self.records[series_id] = dict(record)
+                else:
+                    existing.update(record)
+                merged.append(dict(existing))
+        for listener in self.listeners:
+            listener(merged)
+
+    def get(self, series_id, complete=False):
+        """
+        Returns a copy of the stored record for `series_id`, or None if the series has never been seen. With
+        `complete`, None is also returned when the record lacks one of the `core_fields`.
+        """
+        with self.lock:
+            record = self.records.get(series_id)
+            if record is None or (complete and any(field not in record for field in self.core_fields)):
+                return None
+            return dict(record)
+
+    def __contains__(self, series_id):
+        return series_id in self.records
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,169 @@
+import threading
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+
+class _GrowableArray:
+    """
+    A typed array with amortized O(1) appends: the buffer doubles whenever it runs out of room, so appending n rows
+    in many small batches copies each row a constant number of times on average.
+    """
+    def __init__(self, dtype, capacity=1024):
+        self.buffer = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        needed = self.size + len(values)
+        if needed > len(self.buffer):
+            grown = np.empty(max(needed, 2 * len(self.buffer)), dtype=self.buffer.dtype)
+            grown[:self.size] = self.buffer[:self.size]
+            self.buffer = grown
+        self.buffer[self.size:needed] = values
+        self.size = needed
+
+    def view(self, start=0, stop=None):
+        return self.buffer[start:self.size if stop is None else stop]
+
+
+class SeriesStore:
+    """
+    Keeps retrieved observations of many series in contiguous typed arrays with a per-series offset index.
+
+    Every column of the retrieved frames is kept in one growable NumPy array (float64 values, datetime64 dates,
+    object arrays for keys), and each series' rows occupy one contiguous range of those arrays. Looking up a series
+    is a dictionary lookup followed by array slicing, so it takes the same time however many series are stored, and
+    appending never concatenates DataFrames. Columns that hold one value per retrieved series, such as 'Series' and
+    the URLs, are stored once per run of equal values rather than once per row.
+
+    The store's append method has the sink signature of the retrieve_series_* methods, so it can collect a bulk
+    retrieval directly.
+
+    Attributes:
+    - segment_columns (tuple): Columns stored once per run of equal values instead of once per row.
+    - columns (list): The column order of the stored frames, taken from the first frame appended. Every later frame
+      must have the same set of columns.
+
+    Usage:
+        store = SeriesStore()
+        fred.retrieve_series_latest_release(series_list, sink=store.append)
+        unrate = store["UNRATE"]
+        values = store.column("UNRATE", "Value")
+        everything = store.to_frame()
+    """
+    segment_columns = ('Series', 'Website URL', 'JSON URL')
+
+    def __init__(self):
+        self.columns = None
+        self.arrays = {}
+        self.segments = {}
+        self.segment_starts = []
+        self.segment_stops = []
+        self.segment_values = {}
+        self.lock = threading.Lock()
+
+    def append(self, series_id, df):
+        """
+        Adds the rows of `df` for `series_id`. A series appended again gets its new rows added after its earlier
+        ones. Raises ValueError if `df` does not have the columns of the frames appended before it.
+        """
+        if df is None or df.empty:
+            return
+        with self.lock:
+            if self.columns is not None and set(df.columns) != set(self.columns):
+                raise ValueError(f"Cannot append {series_id}: its columns {sorted(df.columns)} differ from the "
+                                 f"stored columns {sorted(self.columns)}.")
+            if self.columns is None:
+                self.columns = list(df.columns)
+                for column in self.columns:
+                    if column not in self.segment_columns:
+                        dtype = df[column].dtype if df[column].dtype.kind in 'biufcmM' else object
+                        self.arrays[column] = _GrowableArray(dtype)
+                    else:
+                        self.segment_values[column] = []
+            start = self._rows()
+            for column, array in self.arrays.items():
+                array.extend(df[column].to_numpy())
+            # A frame can span several values of a segment column (e.g. vintage batches with their own URLs), so it
+            # is stored as one segment per run of rows whose segment values are all equal
+            segment_data = {column: df[column].to_numpy(dtype=object) for column in self.segment_values}
+            starts_run = np.zeros(len(df), dtype=bool)
+            starts_run[0] = True
+            for values in segment_data.values():
+                missing = pd.isna(values)
+                starts_run[1:] |= (values[1:] != values[:-1]) & ~(missing[1:] & missing[:-1])
+            run_starts = np.flatnonzero(starts_run)
+            run_stops = np.append(run_starts[1:], len(df))
+            for run_start, run_stop in zip(run_starts, run_stops):
+                for column, values in segment_data.items():
+                    self.segment_values[column].append(values[run_start])
+                self.segments.setdefault(series_id, []).append(len(self.segment_starts))
+                self.segment_starts.append(start + int(run_start))
+                self.segment_stops.append(start + int(run_stop))
+
+    def _rows(self):
+        return next(iter(self.arrays.values())).size if self.arrays else 0
+
+    def __len__(self):
+        return self._rows()
+
+    def __contains__(self, series_id):
+        return series_id in self.segments
+
+    @property
+    def series(self):
+        return list(self.segments)
+
+    def column(self, series_id, column):
+        """
+        Returns one column of a series as a NumPy array. For a series stored as one segment this is a view of the
+        store's array, not a copy.
+        """
+        segments = self.segments[series_id]
+        if column in self.segment_values:
+            return np.concatenate([
+                np.full(self.segment_stops[segment] - self.segment_starts[segment],
+                        self.segment_values[column][segment], dtype=object)
+                for segment in segments])
+        array = self.arrays[column]
+        if len(segments) == 1:
+            return array.view(self.segment_starts[segments[0]], self.segment_stops[segments[0]])
+        return np.concatenate([array.view(self.segment_starts[segment], self.segment_stops[segment])
+                               for segment in segments])
+
+    def __getitem__(self, series_id):
+        """
+        Returns the rows of one series as a DataFrame in the shape it was appended in.
+        """
+        if series_id not in self.segments:
+            raise KeyError(series_id)
+        data = {column: self.column(series_id, column) for column in self.columns}
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+    def to_frame(self, categorical=False):
+        """
+        Returns every stored row as one DataFrame in the shape of the retrieve_series_* results, in append order.
+
+        Row columns are handed to pandas as views of the store's arrays. The per-series columns are expanded to one
+        value per row; with `categorical=True` they become pandas Categoricals built from the segment index, which
+        avoids creating one Python object reference per row.
+        """
+        if self.columns is None:
+            return pd.DataFrame()
+        lengths = np.asarray(self.segment_stops, dtype=np.int64) - np.asarray(self.segment_starts, dtype=np.int64)
+        data = {}
+        for column in self.columns:
+            if column in self.segment_values:
+                values = np.asarray(self.segment_values[column], dtype=object)
+                if categorical:
+                    categories, codes = np.unique(values.astype(str), return_inverse=True)
+                    data[column] = pd.Categorical.from_codes(np.repeat(codes, lengths), categories)
+                else:
+                    data[column] = np.repeat(values, lengths)
+            else:
+                data[column] = self.arrays[column].view()
+        return pd.DataFrame(data, columns=self.columns, copy=False)
@@ -0,0 +1,64 @@
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url, ignore=()):
+    """
+    Returns a canonical form of `url` for use as a request key: scheme and host are lower-cased and the query
+    parameters are sorted, so the same FRED resource always maps to the same key regardless of parameter order.
+    Query parameters named in `ignore`, such as the API key, are left out of the key.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if name not in ignore))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into a single execution.
+
+    The first thread to ask for a key runs the function; threads asking for the same key while that call is in
+    flight wait for it and receive the same result, or the same exception. Once the call finishes the key is
+    released, so later calls run again and nothing is cached beyond the lifetime of the request.
+
+    Usage:
+        in_flight = SingleFlight()
+        response = in_flight.do(normalize_url(url), lambda: requests.get(url))
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.shared = 0
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+            else:
+                self.shared += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+        return call.result
@@ -0,0 +1,173 @@
+# Compact, token-budgeted text summaries of FRED data frames for use in language model prompts
+try:
+    from .LazyImport import LazyModule
+except ImportError:  # Running from inside the FredBrain folder rather than as an installed package
+    from LazyImport import LazyModule
+
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+
+# Roughly four characters per token for English text and numbers with the OpenAI tokenizers
+chars_per_token = 4
+
+
+def estimate_tokens(text):
+    """
+    Returns an estimate of the number of tokens in `text`, without needing a tokenizer.
+    """
+    return len(text) // chars_per_token + 1
+
+
+def long_frame(data_frame):
+    """
+    Brings a frame into the long 'Series', 'Reporting Date', 'Value' shape returned by the retrieve_series_* methods.
+
+    Frames that already have those columns are passed through. Other frames are treated as wide: every numeric
+    column becomes a series, dated by a DatetimeIndex, a 'Reporting Date' or 'date' column, or else by row number.
+
+    Returns:
+    - pandas.DataFrame: The long frame, sorted by series and date. Empty if `data_frame` has no numeric data.
+    """
+    if {'Series', 'Reporting Date', 'Value'}.issubset(data_frame.columns):
+        long = data_frame[['Series', 'Reporting Date', 'Value']].copy()
+    else:
+        wide = data_frame
+        for date_column in ('Reporting Date', 'date', 'Date'):
+            if date_column in wide.columns:
+                wide = wide.set_index(date_column)
+                break
+        numeric = wide.select_dtypes('number')
+        if numeric.empty:
+            return pd.DataFrame(columns=['Series', 'Reporting Date', 'Value'])
+        long = numeric.rename_axis('Reporting Date').reset_index().melt(
+            id_vars='Reporting Date', var_name='Series', value_name='Value')
+    if not pd.api.types.is_numeric_dtype(long['Reporting Date']):
+        long['Reporting Date'] = pd.to_datetime(long['Reporting Date'])
+    long['Value'] = pd.to_numeric(long['Value'], errors='coerce')
+    long['Series'] = long['Series'].astype(str)
+    long = long[long['Value'].notna()]
+    return long.sort_values(['Series', 'Reporting Date'], kind='mergesort').reset_index(drop=True)
+
+
+def _elapsed_years(dates):
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return (dates - dates.min()).dt.days.to_numpy(dtype=float) / 365.25
+    return dates.to_numpy(dtype=float)
+
+
+def series_statistics(long):
+    """
+    Computes per-series statistics of a long frame in one grouped pass: observation count, date range, first and
+    last value, minimum, maximum, mean, standard deviation, total change and the least-squares trend per year (per
+    row for frames without dates).
+    """
+    x = _elapsed_years(long['Reporting Date'])
+    y = long['Value'].to_numpy(dtype=float)
+    grouped = pd.DataFrame({'Series': long['Series'], 'x': x, 'y': y, 'xx': x * x, 'xy': x * y}).groupby(
+        'Series', sort=True)
+    sums = grouped[['x', 'y', 'xx', 'xy']].sum()
+    count = grouped.size()
+    variance = sums['xx'] - sums['x'] ** 2 / count
+    covariance = sums['xy'] - sums['x'] * sums['y'] / count
+    values = long.groupby('Series', sort=True)['Value']
+    dates = long.groupby('Series', sort=True)['Reporting Date']
+    statistics = pd.DataFrame({
+        'Observations': count,
+        'Start': dates.first(),
+        'End': dates.last(),
+        'First': values.first(),
+        'Last': values.last(),
+        'Min': values.min(),
+        'Max': values.max(),
+        'Mean': values.mean(),
+        'Std': values.std(),
+    })
+    statistics['Change'] = statistics['Last'] - statistics['First']
+    statistics['Trend'] = (covariance / variance.where(variance > 0)).to_numpy()
+    return statistics.reset_index()
+
+
+def change_points(long, per_series=3, threshold=3.0):
+    """
+    Finds the largest moves of every series: period-to-period changes that exceed `threshold` times the series'
+    median absolute change, at most `per_series` of them per series, largest first.
+    """
+    change = long.groupby('Series', sort=False)['Value'].diff()
+    scale = change.abs().groupby(long['Series']).transform('median')
+    score = change.abs() / scale.where(scale > 0)
+    moves = long.assign(Change=change, Score=score)
+    moves = moves[moves['Score'] > threshold]
+    moves = moves.sort_values(['Series', 'Score'], ascending=[True, False], kind='mergesort')
+    return moves.groupby('Series', sort=False).head(per_series)[['Series', 'Reporting Date', 'Value', 'Change']]
+
+
+def downsample(long, points):
+    """
+    Keeps about `points` evenly spaced observations of every series, always including its first and last one.
+    """
+    grouped = long.groupby('Series', sort=False)
+    position = grouped.cumcount().to_numpy()
+    size = grouped['Value'].transform('size').to_numpy()
+    step = np.maximum(np.ceil(size / max(points, 1)), 1)
+    keep = (position % step == 0) | (position == size - 1)
+    return long[keep]
+
+
+def _format(table, float_format='%.6g'):
+    return table.to_csv(index=False, float_format=float_format, date_format='%Y-%m-%d')
+
+
+def summarize_frame(data_frame, token_budget=3000, points_per_series=60, moves_per_series=3):
+    """
+    Summarizes a frame as text that fits within `token_budget` tokens where possible.
+
+    The summary has per-series statistics (including trend), the largest moves of every series, and a downsampled
+    set of observations. The number of sampled observations per series is halved until the summary fits, and the
+    samples are dropped entirely if the statistics and moves alone use up the budget.
+
+    Parameters:
+    - data_frame (pandas.DataFrame): A long frame as returned by retrieve_series_*, or a wide numeric frame.
+    - token_budget (int, optional): The target size of the summary in tokens.
+    - points_per_series (int, optional): The largest number of sampled observations kept per series.
+    - moves_per_series (int, optional): The number of largest moves reported per series.
+
+    Returns:
+    - str: The summary. Frames without numeric data are returned as CSV.
+    """
+    long = long_frame(data_frame)
+    if long.empty:
+        return data_frame.to_csv()
+    header = (f"Series statistics (Trend is the least-squares slope per year):\n{_format(series_statistics(long))}\n"
+              f"Largest moves:\n{_format(change_points(long, moves_per_series))}")
+    points = points_per_series
+    while points >= 2:
+        sampled = downsample(long, points)
+        text = f"{header}\nObservations (about {points} per series, evenly spaced):\n{_format(sampled)}"
+        if estimate_tokens(text) <= token_budget:
+            return text
+        points //= 2
+    return header
+
+
+def summarize_chunks(data_frame, token_budget=3000, points_per_series=60, moves_per_series=3):
+    """
+    Splits a frame by series into as few groups as needed for each group's summary to fit `token_budget`, and
+    returns one summary per group. A single series is never split, so a very long series may still exceed the
+    budget on its own.
+
+    Returns:
+    - list: The summaries, in series order.
+    """
+    long = long_frame(data_frame)
+    if long.empty:
+        return [data_frame.to_csv()]
+    summary = summarize_frame(long, token_budget, points_per_series, moves_per_series)
+    series = long['Series'].unique()
+    if estimate_tokens(summary) <= token_budget or len(series) == 1:
+        return [summary]
+    groups = np.array_split(series, min(len(series), -(-estimate_tokens(summary) // token_budget) + 1))
+    chunks = []
+    for group in groups:
+        chunks.extend(summarize_chunks(long[long['Series'].isin(group)], token_budget, points_per_series,
+                                       moves_per_series))
+    return chunks
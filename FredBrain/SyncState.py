@@ -0,0 +1,89 @@
+import json
+import os
+from datetime import datetime
+
+
+class SyncState:
+    """
+    Persists the FRED 'last_updated' stamp of every tracked series together with the time each series was last
+    checked.
+
+    FredBrain.sync_series compares these stamps with the current ones reported by FRED and only re-downloads the
+    observations of series whose stamp moved. The state is a small JSON file that is rewritten atomically on save,
+    so an interrupted sync leaves the previous state intact.
+
+    Attributes:
+    - path (str): Location of the JSON state file. Parent folders are created if needed.
+    - last_updated (dict): Maps series IDs to the 'last_updated' value seen when they were last stored.
+    - last_sync (datetime or None): When the last successful sync started.
+    - last_checked (dict): Maps series IDs to when the sync that last checked them started. A sync of a subset of
+      the series only moves the times of that subset, so the updates feed window of a later sync can start at the
+      oldest check among the series it covers.
+
+    Usage:
+        state = SyncState("state/latest_releases.json")
+        state.last_updated.get("UNRATE")
+    """
+    def __init__(self, path):
+        self.path = path
+        self.last_updated = {}
+        self.last_sync = None
+        self.last_checked = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as state_file:
+                state = json.load(state_file)
+            self.last_updated = state.get('last_updated', {})
+            if state.get('last_sync'):
+                self.last_sync = datetime.fromisoformat(state['last_sync'])
+            self.last_checked = {series_id: datetime.fromisoformat(checked)
+                                 for series_id, checked in state.get('last_checked', {}).items()}
+
+    def changed(self, current):
+        """
+        Returns the series IDs in `current` (a dict of series ID to 'last_updated') whose stamp differs from the
+        stored one, including series that have never been stored.
+        """
+        return [series_id for series_id, stamp in current.items() if self.last_updated.get(series_id) != stamp]
+
+    def forget(self, series_ids):
+        """
+        Drops the stored stamps of `series_ids`, so the next sync treats them as new and downloads them again.
+        """
+        for series_id in series_ids:
+            self.last_updated.pop(series_id, None)
+            self.last_checked.pop(series_id, None)
+
+    def oldest_check(self, series_ids):
+        """
+        Returns the earliest time at which one of `series_ids` was last checked, or None if one of them never was.
+        State files written before per-series times were kept fall back to `last_sync`.
+        """
+        checks = [self.last_checked.get(series_id, self.last_sync) for series_id in series_ids]
+        if not checks or any(check is None for check in checks):
+            return None
+        return min(checks)
+
+    def update(self, current, sync_started=None, checked=()):
+        """
+        Stores the stamps in `current` and records `sync_started` as the check time of `checked` and of the series
+        in `current`.
+        """
+        self.last_updated.update(current)
+        if sync_started is not None:
+            self.last_sync = sync_started
+            for series_id in list(checked) + list(current):
+                self.last_checked[series_id] = sync_started
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        state = {
+            'last_sync': self.last_sync.isoformat() if self.last_sync else None,
+            'last_updated': self.last_updated,
+            'last_checked': {series_id: checked.isoformat() for series_id, checked in self.last_checked.items()},
+        }
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as state_file:
+            json.dump(state, state_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,30 @@
+from .AnalysisCache import AnalysisCache
+from .CircuitBreaker import CircuitBreaker
+from .FredBrain import FredBrain
+from .JobManifest import JobManifest
+from .KeyPool import KeyPool
+from .Panel import Panel
+from .RateLimit import MemoryRateLimitBackend, RateLimitDecorator, SQLiteRateLimitBackend
+from .ReleaseScheduler import ReleaseScheduler
+from .Revisions import (compact_releases, nth_release, release_as_of_lag, revision_summary,
+                        series_revision_statistics)
+from .Scheduler import RequestScheduler
+from .SearchIndex import SearchIndex
+from .SeriesRegistry import SeriesRegistry
+from .SeriesStore import SeriesStore
+from .SQLiteBrain import SQLiteBrain
+from .SyncState import SyncState
+
+__all__ = ['AnalysisCache', 'CircuitBreaker', 'FredBrain', 'JobManifest', 'KeyPool', 'MemoryRateLimitBackend',
+           'MySQLBrain', 'Panel', 'RateLimitDecorator', 'ReleaseScheduler', 'RequestScheduler', 'SearchIndex',
+           'SeriesRegistry', 'SeriesStore', 'SQLiteBrain', 'SQLiteRateLimitBackend', 'SyncState',
+           'compact_releases', 'nth_release', 'release_as_of_lag', 'revision_summary', 'series_revision_statistics']
+
+
+def __getattr__(name):
+    # MySQLBrain pulls in mysql.connector, so it is only imported when it is asked for
+    if name == 'MySQLBrain':
+        from .MySQLBrain import MySQLBrain
+        globals()['MySQLBrain'] = MySQLBrain
+        return MySQLBrain
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from FredBrain import FredBrain
+from FredBrain.Summarize import estimate_tokens, summarize_chunks
+
+
+class OpenAIStandIn(BaseHTTPRequestHandler):
+    """
+    Answers chat.completions requests like the OpenAI API does, recording every prompt it receives.
+    """
+    prompts = []
+    failing_parts = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][-1]['content']
+        with self.lock:
+            self.prompts.append(prompt)
+            number = len(self.prompts)
+            fail = OpenAIStandIn.failing_parts > 0 and "This is one part of the data" in prompt
+            if fail:
+                OpenAIStandIn.failing_parts -= 1
+        if fail:
+            # A client error, which the OpenAI client does not retry by itself
+            payload = json.dumps({"error": {"message": "bad request", "type": "invalid_request_error"}}).encode()
+            self.send_response(400)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        answer = "combined answer" if "Combine these partial analyses" in prompt else f"partial answer {number}"
+        payload = json.dumps({
+            "id": f"chatcmpl-{number}", "object": "chat.completion", "created": 0, "model": body['model'],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": answer}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def openai_server():
+    OpenAIStandIn.prompts = []
+    OpenAIStandIn.failing_parts = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OpenAIStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fred(openai_server):
+    return FredBrain(fred_api_key='a' * 32, openai_api_key='sk-test',
+                     openai_base_url=f"http://127.0.0.1:{openai_server.server_port}/v1")
+
+
+def series_frame(count, periods=400):
+    dates = pd.date_range('1990-01-01', periods=periods, freq='MS')
+    values = np.r_[np.linspace(4, 6, periods // 2), np.linspace(9, 5, periods - periods // 2)]
+    return pd.concat([pd.DataFrame({'Series': f"S{number}", 'Reporting Date': dates, 'Value': values + number})
+                      for number in range(count)], ignore_index=True)
+
+
+def test_summarize_chunks_stay_within_budget():
+    data = series_frame(300)
+    budget = 3000
+    assert estimate_tokens(data.to_csv()) > budget
+    chunks = summarize_chunks(data, budget)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    # Every series has its statistics row in exactly one chunk
+    for number in range(300):
+        assert sum(chunk.count(f"\nS{number},400,") for chunk in chunks) == 1
+
+
+def test_small_frame_is_one_chunk():
+    chunks = summarize_chunks(series_frame(1), 3000)
+    assert len(chunks) == 1
+    assert estimate_tokens(chunks[0]) <= 3000
+
+
+def test_small_frame_is_analysed_in_one_call(fred, openai_server):
+    answer = fred.analyze_with_chatgpt(series_frame(1), "What happened?")
+    assert answer == "partial answer 1"
+    assert len(OpenAIStandIn.prompts) == 1
+    assert OpenAIStandIn.prompts[0].startswith("What happened?")
+
+
+def test_large_frame_fans_out_and_combines(fred, openai_server):
+    data = series_frame(300)
+    chunks = summarize_chunks(data, fred.summary_token_budget)
+    answer = fred.analyze_with_chatgpt(data, "Compare the series.")
+    assert answer == "combined answer"
+    prompts = OpenAIStandIn.prompts
+    # One call per chunk, then a single combining call that comes last
+    assert len(prompts) == len(chunks) + 1
+    combine = prompts[-1]
+    assert "Combine these partial analyses" in combine
+    assert all("Combine these partial analyses" not in prompt for prompt in prompts[:-1])
+    assert sorted(prompt.split("\n\n", 2)[2] for prompt in prompts[:-1]) == sorted(chunks)
+    for part in range(1, len(chunks) + 1):
+        assert f"Part {part}:\npartial answer" in combine
+
+
+def test_batch_retry_only_resends_failed_parts(fred, openai_server):
+    data = series_frame(300)
+    chunks = summarize_chunks(data, fred.summary_token_budget)
+    fred.backoff_base = 0
+    OpenAIStandIn.failing_parts = 1
+    answers = fred.analyze_batch_with_chatgpt({"all": (data, "Compare the series.")})
+    assert answers == {"all": "combined answer"}
+    prompts = OpenAIStandIn.prompts
+    # Every part once, the failed part once more, then the combining call
+    assert len(prompts) == len(chunks) + 2
+    assert sum("Combine these partial analyses" in prompt for prompt in prompts) == 1
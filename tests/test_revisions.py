@@ -0,0 +1,35 @@
+import pandas as pd
+
+from FredBrain.Revisions import release_as_of_lag
+
+
+def all_releases():
+    return pd.DataFrame({
+        'Published Date': pd.to_datetime(['2020-02-07', '2020-03-06', '2020-04-03', '2020-03-06', '2020-04-03']),
+        'Validity Date': pd.to_datetime(['2020-03-05', '2020-04-02', '2020-05-07', '2020-04-02', '2020-05-07']),
+        'Reporting Date': pd.to_datetime(['2020-01-01', '2020-01-01', '2020-01-01', '2020-02-01', '2020-02-01']),
+        'Value': [3.5, 3.6, 3.6, 3.5, 3.4],
+        'Series': 'UNRATE',
+        'Unique Key': ['a', 'b', 'c', 'd', 'e'],
+    })
+
+
+def test_release_as_of_lag_zero_returns_empty_frame():
+    df = all_releases()
+    result = release_as_of_lag(df, 0)
+    assert result.empty
+    assert list(result.columns) == list(df.columns)
+
+
+def test_release_as_of_lag_shorter_than_first_publication():
+    # The first vintages come out 37 and 33 days after their reporting dates
+    df = all_releases()
+    assert release_as_of_lag(df, 30).empty
+    result = release_as_of_lag(df, 35)
+    assert list(result['Reporting Date']) == [pd.Timestamp('2020-02-01')]
+    assert list(result['Value']) == [3.5]
+
+
+def test_release_as_of_lag_picks_latest_known_vintage():
+    result = release_as_of_lag(all_releases(), 70)
+    assert list(result['Unique Key']) == ['b', 'e']